@@ -0,0 +1,44 @@
+"""Bulk import a JSONL or CSV job feed into the jobs collection.
+
+Usage (from the backend directory, with MONGO_URL/DB_NAME in .env):
+    python import_jobs.py feed.jsonl
+    python import_jobs.py feed.csv --batch-size 5000
+
+Running workers pick up the new catalog version on their next poll.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import server  # noqa: E402
+
+
+async def run(path, fmt, batch_size):
+    try:
+        with open(path, encoding="utf-8", newline="") as text_stream:
+            return await server.import_jobs(
+                server.iter_job_rows(text_stream, fmt), batch_size=batch_size, refresh=False
+            )
+    finally:
+        server.client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import a JSONL or CSV job feed")
+    parser.add_argument("path", help="Path to the feed file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Feed format (default: from extension)")
+    parser.add_argument("--batch-size", type=int, default=server.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    report = asyncio.run(run(args.path, fmt, args.batch_size))
+    print(json.dumps(report, indent=2))
+    return 0 if report["rows_read"] and not report["rejected"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Move inline resume text out of resume_profiles into the compressed blob store.
+
+Usage (from the backend directory, with MONGO_URL/DB_NAME in .env):
+    python migrate_raw_text.py
+    python migrate_raw_text.py --batch-size 1000
+
+Prints the migrated byte counts and the collection sizes before and after.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import server  # noqa: E402
+
+COLLECTIONS = ("resume_profiles", "resume_blobs")
+
+
+async def collection_sizes():
+    sizes = {}
+    for name in COLLECTIONS:
+        try:
+            stats = await server.db.command("collStats", name)
+        except Exception:
+            # collStats fails for collections that do not exist yet
+            stats = {}
+        sizes[name] = {"size": stats.get("size", 0), "storage_size": stats.get("storageSize", 0)}
+    sizes["total"] = {
+        key: sum(sizes[name][key] for name in COLLECTIONS) for key in ("size", "storage_size")
+    }
+    return sizes
+
+
+async def run(batch_size):
+    try:
+        before = await collection_sizes()
+        report = await server.migrate_inline_raw_text(batch_size=batch_size)
+        after = await collection_sizes()
+    finally:
+        server.client.close()
+    report["collections_before"] = before
+    report["collections_after"] = after
+    report["bytes_saved"] = before["total"]["size"] - after["total"]["size"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move inline resume text into the blob store")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.batch_size))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
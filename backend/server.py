@@ -1,30 +1,101 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Header, Depends
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from bson.binary import Binary
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from pymongo import monitoring
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from pydantic import ValidationError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Literal
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 import io
-import PyPDF2
-import docx
+import importlib.util
+import sys
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import orjson
 import urllib.parse
+import asyncio
+import codecs
+import hashlib
+import json
+import sqlite3
+import threading
+import functools
+import hmac
+import csv
+import zlib
+import zipfile
+import base64
+import time
+from collections import OrderedDict
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Heavy libraries only some code paths need are imported on first use, to keep cold starts fast:
+# PyPDF2 and python-docx inside the resume readers, scikit-learn where the catalog fits its models,
+# and scipy.sparse through lazy_import.
+def lazy_import(name):
+    """Module whose import runs on first attribute access"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+sp = lazy_import("scipy.sparse")
+
+# Metrics
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response headers are sent",
+    ["method", "route", "status"]
+)
+STAGE_LATENCY = Histogram(
+    "resume_matcher_stage_duration_seconds", "Latency of individual upload and matching stages",
+    ["stage"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+MONGO_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB round trip latency per command and collection",
+    ["command", "collection"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Record every MongoDB command's duration in MONGO_LATENCY"""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._collections[event.connection_id, event.request_id] = collection if isinstance(collection, str) else ""
+
+    def _observe(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_LATENCY.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+
+    succeeded = _observe
+    failed = _observe
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -50,9 +121,23 @@ class ResumeProfile(BaseModel):
     experience_years: int
     education: str
     certifications: List[str]
-    raw_text: str
+    raw_text: str = ""  # Legacy inline text; new profiles reference raw_text_id instead
+    content_hash: Optional[str] = None  # SHA-256 of the uploaded file, shared by duplicate uploads
+    raw_text_id: Optional[str] = None  # resume_blobs id of the compressed resume text
+    file_id: Optional[str] = None  # resume_blobs id of the original upload, when kept
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class ProfileSummary(BaseModel):
+    """The few profile fields matching needs, read without the resume text"""
+    id: str
+    skills: List[str]
+    experience_years: int
+
+# Field projections for profile reads
+PROFILE_SUMMARY_PROJECTION = {"_id": 0, "id": 1, "skills": 1, "experience_years": 1}
+PROFILE_SEMANTIC_PROJECTION = {**PROFILE_SUMMARY_PROJECTION, "text_vector": 1, "content_hash": 1}
+PROFILE_LIST_PROJECTION = {"_id": 0, "raw_text": 0, "text_vector": 0}
+
 class JobMatch(BaseModel):
     id: str
     title: str
@@ -63,15 +148,58 @@ class JobMatch(BaseModel):
     location: str
     salary_range: str
     fit_score: float
+    semantic_score: Optional[float] = None
     matched_skills: List[str]
     missing_skills: List[str]
     job_search_urls: Dict[str, str]
 
+# JobMatch fields returned unless a request selects others with fields=
+LEAN_MATCH_FIELDS = ("id", "fit_score", "semantic_score", "matched_skills", "missing_skills")
+
+def parse_match_fields(fields):
+    """JobMatch fields selected by a comma-separated fields= value, in JobMatch order.
+
+    None gives the lean default, "all" every field; id is always included.
+    """
+    if fields is None:
+        return LEAN_MATCH_FIELDS
+    if fields.strip() == "all":
+        return tuple(JobMatch.model_fields)
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - JobMatch.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown match fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in JobMatch.model_fields if field in selected or field == "id")
+
+class JobPosting(BaseModel):
+    id: str = Field(default_factory=lambda: f"job_{uuid.uuid4().hex[:12]}")
+    title: str
+    company: str
+    required_skills: List[str]
+    experience_required: int
+    description: str = ""
+    location: str = ""
+    salary_range: str = ""
+
+class BatchMatchRequest(BaseModel):
+    profile_ids: List[str]
+    top_k: int = 10
+    include_unmatched: bool = False
+    fields: Optional[str] = None  # comma-separated JobMatch fields, or "all"
+
+class CandidateSearchRequest(BaseModel):
+    top_k: int = 10
+    min_experience_years: Optional[int] = None
+    max_experience_years: Optional[int] = None
+
 class LearningRecommendation(BaseModel):
     skill: str
     google_search_url: str
     learning_platform_urls: Dict[str, str]
     priority: str  # "high", "medium", "low"
+    fit_gain: Optional[float] = None  # fit points gained across the candidate's top matches
+    matched_jobs_requiring: Optional[int] = None
+    catalog_jobs_requiring: Optional[int] = None
 
 # Sample job database
 SAMPLE_JOBS = [
@@ -137,92 +265,403 @@ SAMPLE_JOBS = [
     }
 ]
 
+# Resume size limits
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.environ.get("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+MAX_RESUME_PAGES = int(os.environ.get("MAX_RESUME_PAGES", "100"))
+MAX_RESUME_TEXT_CHARS = int(os.environ.get("MAX_RESUME_TEXT_CHARS", "1000000"))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
 # Utility functions
+class ResumeParseError(Exception):
+    """Raised from parse workers for unreadable files (picklable, unlike HTTPException)"""
+
+def open_resume_source(source):
+    """Binary file object for upload content held in memory (bytes) or spooled to disk (path)"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, 'rb')
+
+def iter_pdf_pages(source, max_pages=None):
+    """Yield the text of each PDF page, stopping after max_pages"""
+    max_pages = MAX_RESUME_PAGES if max_pages is None else max_pages
+    import PyPDF2
+
+    with open_resume_source(source) as stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        for page_number, page in enumerate(pdf_reader.pages):
+            if page_number >= max_pages:
+                break
+            yield page.extract_text()
+
+def iter_docx_paragraphs(source):
+    """Yield the text of each DOCX paragraph, newline terminated"""
+    import docx
+
+    with open_resume_source(source) as stream:
+        doc = docx.Document(stream)
+        for paragraph in doc.paragraphs:
+            yield paragraph.text + "\n"
+
+def iter_txt_chunks(source):
+    """Yield decoded UTF-8 text in fixed-size blocks"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open_resume_source(source) as stream:
+        while True:
+            block = stream.read(UPLOAD_CHUNK_BYTES)
+            if not block:
+                break
+            yield decoder.decode(block)
+        yield decoder.decode(b'', final=True)
+
+def iter_capped(chunks, max_chars=None):
+    """Pass chunks through until max_chars characters have been produced"""
+    remaining = MAX_RESUME_TEXT_CHARS if max_chars is None else max_chars
+    for chunk in chunks:
+        if len(chunk) >= remaining:
+            yield chunk[:remaining]
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+# File type label and chunk generator by extension
+RESUME_READERS = {
+    '.pdf': ("PDF", iter_pdf_pages),
+    '.docx': ("DOCX", iter_docx_paragraphs),
+    '.txt': ("TXT", iter_txt_chunks),
+}
+
+def iter_resume_chunks(filename, source):
+    """Yield capped text chunks for a resume, raising ResumeParseError on unreadable files"""
+    label, reader = RESUME_READERS[os.path.splitext(filename.lower())[1]]
+    try:
+        yield from iter_capped(reader(source))
+    except Exception as e:
+        raise ResumeParseError(f"Error reading {label}: {str(e)}")
+
 def extract_text_from_pdf(file_content):
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return "".join(iter_capped(iter_pdf_pages(file_content)))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
 
 def extract_text_from_docx(file_content):
     """Extract text from DOCX file"""
     try:
-        doc = docx.Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "".join(iter_capped(iter_docx_paragraphs(file_content)))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading DOCX: {str(e)}")
 
+async def spool_upload(file, max_bytes=None):
+    """Read an upload in chunks, enforcing the size cap.
+
+    Returns (source, sha256 hex digest of the content). Small uploads come
+    back as bytes; once UPLOAD_SPOOL_BYTES is exceeded the content is spooled
+    to a temporary file and its path is returned instead, so large files are
+    never held in memory. Release the source with release_upload.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    chunks, size, spool = [], 0, None
+    digest = hashlib.sha256()
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte upload limit")
+            if spool is None and size > UPLOAD_SPOOL_BYTES:
+                spool = tempfile.NamedTemporaryFile(prefix="resume-", delete=False)
+                spool.writelines(chunks)
+                chunks = []
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+    if spool is None:
+        return b"".join(chunks), digest.hexdigest()
+    spool.close()
+    return spool.name, digest.hexdigest()
+
+def release_upload(source):
+    """Delete the temporary file behind a spooled upload, if any"""
+    if isinstance(source, str):
+        try:
+            os.unlink(source)
+        except FileNotFoundError:
+            pass
+
+# Common tech skills vocabulary
+TECH_SKILLS = (
+    "python", "java", "javascript", "typescript", "react", "angular", "vue",
+    "nodejs", "express", "django", "fastapi", "flask", "spring", "html", "css",
+    "sql", "mongodb", "postgresql", "mysql", "redis", "docker", "kubernetes",
+    "aws", "azure", "gcp", "git", "jenkins", "terraform", "linux", "windows",
+    "machine learning", "deep learning", "tensorflow", "pytorch", "pandas",
+    "numpy", "scikit-learn", "jupyter", "r", "matlab", "tableau", "power bi",
+    "agile", "scrum", "testing", "unit testing", "integration testing",
+    "webpack", "redux", "graphql", "rest api", "microservices", "devops",
+    "ci/cd", "monitoring", "elasticsearch", "kafka", "spark", "hadoop",
+    "blockchain", "solidity", "php", "ruby", "go", "rust", "swift", "kotlin"
+)
+
+class SkillMatcher:
+    """Find every known skill in a text with a single compiled regex pass.
+
+    The skills are folded into a character trie and emitted as one nested
+    alternation, so the scan cost grows with the text length rather than
+    with the size of the vocabulary. Matches must sit on word boundaries,
+    which keeps short skills such as "r" or "go" from firing inside other
+    words. A multi-word skill that contains another skill ("unit testing"
+    contains "testing") reports both, as the substring scan used to.
+    """
+
+    def __init__(self, skills):
+        self.skills = tuple(dict.fromkeys(skill.lower().strip() for skill in skills if skill.strip()))
+        self.vocabulary = frozenset(self.skills)
+        self.pattern = re.compile(r'(?<!\w)(?:' + self._trie_pattern(self.skills) + r')(?!\w)')
+        self.implied = {}
+        known = set(self.skills)
+        for skill in self.skills:
+            contained = [other for other in self._bounded_substrings(skill) if other in known]
+            if contained:
+                self.implied[skill] = tuple(contained)
+
+    @staticmethod
+    def _bounded_substrings(skill):
+        """Yield the proper substrings of skill that start and end on word boundaries"""
+        starts = [0] + [i for i in range(1, len(skill)) if not re.match(r'\w', skill[i - 1])]
+        ends = [i for i in range(1, len(skill)) if not re.match(r'\w', skill[i])] + [len(skill)]
+        for start in starts:
+            for end in ends:
+                if start < end and (start, end) != (0, len(skill)):
+                    yield skill[start:end]
+
+    @staticmethod
+    def _trie_pattern(words):
+        """Build a regex alternation from a character trie of words"""
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def render(node):
+            terminal = '' in node
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if terminal:
+                # Greedy optional group: prefer the longest skill, fall back when the boundary fails
+                return '(?:' + body + ')?'
+            return body
+
+        return render(trie)
+
+    def find_all(self, text):
+        """Return the unique skills found in text, in order of first appearance"""
+        found = {}
+        for match in self.pattern.finditer(text.lower()):
+            skill = match.group(0)
+            found[skill] = None
+            for implied in self.implied.get(skill, ()):
+                found[implied] = None
+        return list(found)
+
+# Built once at import time and shared by every request
+SKILL_MATCHER = SkillMatcher(TECH_SKILLS)
+
+# Common spellings of vocabulary skills in job feeds
+SKILL_ALIASES = {
+    "node": "nodejs", "node.js": "nodejs", "golang": "go", "js": "javascript",
+    "ts": "typescript", "postgres": "postgresql", "k8s": "kubernetes",
+    "sklearn": "scikit-learn", "ml": "machine learning", "react.js": "react",
+    "reactjs": "react", "vue.js": "vue", "vuejs": "vue", "powerbi": "power bi",
+    "ci cd": "ci/cd", "cicd": "ci/cd", "rest": "rest api", "amazon web services": "aws",
+    "google cloud": "gcp",
+}
+
+def normalize_skills(skills, unknown=None):
+    """Canonical, de-duplicated skill names in the vocabulary extract_skills_from_text produces.
+
+    Names outside the vocabulary become the vocabulary skills SKILL_MATCHER
+    finds in them ("java 8" -> "java"); names it finds none in are kept as
+    written and, when unknown is a set, added to it.
+    """
+    normalized = {}
+    for skill in skills:
+        skill = " ".join(str(skill).lower().split())
+        if not skill:
+            continue
+        skill = SKILL_ALIASES.get(skill, skill)
+        found = [skill] if skill in SKILL_MATCHER.vocabulary else SKILL_MATCHER.find_all(skill)
+        if not found:
+            found = [skill]
+            if unknown is not None:
+                unknown.add(skill)
+        normalized.update(dict.fromkeys(found))
+    return list(normalized)
+
 def extract_skills_from_text(text):
     """Extract skills from resume text using pattern matching"""
-    # Common tech skills pattern
-    tech_skills = [
-        "python", "java", "javascript", "typescript", "react", "angular", "vue",
-        "nodejs", "express", "django", "fastapi", "flask", "spring", "html", "css",
-        "sql", "mongodb", "postgresql", "mysql", "redis", "docker", "kubernetes",
-        "aws", "azure", "gcp", "git", "jenkins", "terraform", "linux", "windows",
-        "machine learning", "deep learning", "tensorflow", "pytorch", "pandas",
-        "numpy", "scikit-learn", "jupyter", "r", "matlab", "tableau", "power bi",
-        "agile", "scrum", "testing", "unit testing", "integration testing",
-        "webpack", "redux", "graphql", "rest api", "microservices", "devops",
-        "ci/cd", "monitoring", "elasticsearch", "kafka", "spark", "hadoop",
-        "blockchain", "solidity", "php", "ruby", "go", "rust", "swift", "kotlin"
-    ]
-    
-    text_lower = text.lower()
-    found_skills = []
-    
-    for skill in tech_skills:
-        if skill in text_lower:
-            found_skills.append(skill)
-    
-    return list(set(found_skills))  # Remove duplicates
+    return SKILL_MATCHER.find_all(text)
 
-def extract_experience_years(text):
-    """Extract years of experience from resume text"""
-    patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'experience\s*[:\-]?\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s*in\s*(?:software|development|programming)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        if matches:
-            return int(matches[0])
-    
-    # Default fallback based on text length and complexity
-    if len(text) > 2000:
+# Experience patterns, in priority order
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'),
+    re.compile(r'experience\s*[:\-]?\s*(\d+)\+?\s*years?'),
+    re.compile(r'(\d+)\+?\s*years?\s*in\s*(?:software|development|programming)'),
+]
+
+def experience_fallback(text_length):
+    """Default experience estimate based on text length and complexity"""
+    if text_length > 2000:
         return 3
-    elif len(text) > 1000:
+    elif text_length > 1000:
         return 2
     else:
         return 1
 
-def extract_basic_info(text):
-    """Extract name and email from resume text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    email = emails[0] if emails else "Not found"
-    
-    # Simple name extraction (first line often contains name)
-    lines = text.strip().split('\n')
-    name = "Not found"
-    for line in lines[:5]:  # Check first 5 lines
-        line = line.strip()
-        if len(line) > 2 and len(line) < 50 and not '@' in line:
+class ProfileFieldExtractor:
+    """Single-pass extraction of experience, name and email, compiled once.
+
+    Experience: the first match of the highest-priority pattern that
+    matches anywhere. The text is lowercased once, patterns are searched in
+    priority order and the first hit ends the search; text without the
+    keyword every pattern requires is not searched at all.
+    Email: the first match in the original text.
+    Name: the first of the leading name_window_lines lines (after leading
+    whitespace) that looks like a name; the rest of the text is never split.
+
+    extract() also returns (start, end) offsets of each field. Experience
+    offsets refer to the lowercased text, which only differs in length
+    from the original for a few characters such as 'İ'.
+    """
+
+    EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    NAME_PATTERN = r'[A-Za-z\s]+'
+    # Every experience pattern matches "year"; a cheap substring test rules most text out
+    EXPERIENCE_KEYWORD = "year"
+
+    def __init__(self, experience_patterns=EXPERIENCE_PATTERNS, name_window_lines=5):
+        self.experience_patterns = list(experience_patterns)
+        self.pattern_count = len(self.experience_patterns)
+        self.email = re.compile(self.EMAIL_PATTERN)
+        self.name_line = re.compile(self.NAME_PATTERN)
+        self.first_text = re.compile(r'\S')
+        self.name_window_lines = name_window_lines
+
+    def scan_experience(self, text_lower, hits):
+        """Fill hits[i] with (years, start, end) of pattern i's first match in text_lower.
+
+        Patterns are searched in priority order and the search ends at the
+        first hit. Entries already set are kept, so text can be fed in
+        chunks until hits[0] is set.
+        """
+        if self.EXPERIENCE_KEYWORD not in text_lower:
+            return
+        for i, pattern in enumerate(self.experience_patterns):
+            if hits[i] is not None:
+                continue
+            match = pattern.search(text_lower)
+            if match:
+                hits[i] = (int(match.group(1)), match.start(), match.end())
+                return
+
+    @staticmethod
+    def best_experience(hits):
+        """Highest-priority hit, or None"""
+        return next((hit for hit in hits if hit is not None), None)
+
+    def find_name(self, text):
+        """(name, (start, end)) from the leading lines of text, or ("Not found", None)"""
+        first = self.first_text.search(text)
+        pos = first.start() if first else len(text)
+        for _ in range(self.name_window_lines):
+            newline = text.find('\n', pos)
+            line_end = len(text) if newline == -1 else newline
+            raw = text[pos:line_end]
+            line = raw.strip()
             # Simple heuristic: name is usually short and doesn't contain symbols
-            if re.match(r'^[A-Za-z\s]+$', line):
-                name = line
+            if 2 < len(line) < 50 and '@' not in line and self.name_line.fullmatch(line):
+                start = pos + len(raw) - len(raw.lstrip())
+                return line, (start, start + len(line))
+            if newline == -1:
                 break
-    
+            pos = newline + 1
+        return "Not found", None
+
+    def find_email(self, text):
+        """(email, (start, end)) of the first address in text, or ("Not found", None)"""
+        match = self.email.search(text)
+        return (match.group(0), match.span()) if match else ("Not found", None)
+
+    def find_experience(self, text):
+        """(years, (start, end)) from the experience patterns, or the length-based estimate with None"""
+        hits = [None] * self.pattern_count
+        self.scan_experience(text.lower(), hits)
+        hit = self.best_experience(hits)
+        if hit is None:
+            return experience_fallback(len(text)), None
+        return hit[0], hit[1:]
+
+    def extract(self, text):
+        """Experience, name and email with the offsets where each was found"""
+        experience_years, experience_span = self.find_experience(text)
+        name, name_span = self.find_name(text)
+        email, email_span = self.find_email(text)
+        return {
+            "name": name,
+            "name_span": name_span,
+            "email": email,
+            "email_span": email_span,
+            "experience_years": experience_years,
+            "experience_span": experience_span,
+        }
+
+PROFILE_EXTRACTOR = ProfileFieldExtractor()
+
+def extract_experience_years(text):
+    """Extract years of experience from resume text"""
+    return PROFILE_EXTRACTOR.find_experience(text)[0]
+
+class ResumeChunkScanner:
+    """Run experience extraction over text chunks as they arrive.
+
+    The first hit of each pattern is remembered and scanning stops once the
+    top-priority pattern has hit, so the result matches
+    extract_experience_years on the joined text (barring matches that
+    straddle a chunk boundary).
+    """
+
+    def __init__(self, extractor=None):
+        self.extractor = extractor or PROFILE_EXTRACTOR
+        self.experience_hits = [None] * self.extractor.pattern_count
+        self.length = 0
+
+    def feed_experience(self, chunk):
+        self.length += len(chunk)
+        if self.experience_hits[0] is None:
+            self.extractor.scan_experience(chunk.lower(), self.experience_hits)
+
+    def experience_years(self):
+        hit = self.extractor.best_experience(self.experience_hits)
+        return hit[0] if hit is not None else experience_fallback(self.length)
+
+def extract_basic_info(text):
+    """Extract name and email from resume text"""
+    name, _ = PROFILE_EXTRACTOR.find_name(text)
+    email, _ = PROFILE_EXTRACTOR.find_email(text)
     return name, email
 
 def calculate_job_match_score(candidate_skills, job_skills):
@@ -238,27 +677,35 @@ def calculate_job_match_score(candidate_skills, job_skills):
     
     return round(match_ratio * 100, 1)
 
-def generate_learning_recommendations(missing_skills):
-    """Generate learning recommendations with platform URLs for missing skills"""
+@functools.lru_cache(maxsize=4096)
+def generate_learning_search_url(skill):
+    """Google search URL for learning a skill (memoized per skill)"""
+    search_query = f"learn {skill} online course tutorial"
+    return f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
+
+def generate_learning_recommendations(missing_skills, skill_gaps=None):
+    """Generate learning recommendations with platform URLs for missing skills.
+
+    missing_skills should be ordered most valuable first; skill_gaps maps a
+    skill to the gain figures reported alongside it.
+    """
     recommendations = []
+    skill_gaps = skill_gaps or {}
     
     # Priority mapping
     high_priority_skills = ["python", "javascript", "react", "sql", "aws", "docker"]
     
     for skill in missing_skills[:8]:  # Limit to top 8 missing skills
         priority = "high" if skill.lower() in high_priority_skills else "medium"
-        platform_urls = generate_learning_platform_urls(skill)
-        
-        # Create targeted search query for Google
-        search_query = f"learn {skill} online course tutorial"
-        encoded_query = urllib.parse.quote(search_query)
-        google_search_url = f"https://www.google.com/search?q={encoded_query}"
-        
+        gap = skill_gaps.get(skill, {})
         recommendations.append(LearningRecommendation(
             skill=skill,
-            google_search_url=google_search_url,
-            learning_platform_urls=platform_urls,
-            priority=priority
+            google_search_url=generate_learning_search_url(skill),
+            learning_platform_urls=generate_learning_platform_urls(skill),
+            priority=priority,
+            fit_gain=gap.get("fit_gain"),
+            matched_jobs_requiring=gap.get("matched_jobs_requiring"),
+            catalog_jobs_requiring=gap.get("catalog_jobs_requiring")
         ))
     
     return recommendations
@@ -284,8 +731,12 @@ def generate_job_search_urls(job_title, company, location):
     
     return search_urls
 
+@functools.lru_cache(maxsize=4096)
 def generate_learning_platform_urls(skill):
-    """Generate search URLs for various learning platforms"""
+    """Generate search URLs for various learning platforms.
+
+    Memoized per skill: the returned dict is shared and must not be mutated.
+    """
     encoded_skill = urllib.parse.quote(skill)
     skill_course_query = urllib.parse.quote(f"{skill} course tutorial")
     
@@ -304,149 +755,2296 @@ def generate_learning_platform_urls(skill):
     
     return platform_urls
 
+# Caches
+class LRUCache:
+    """Small in-process least-recently-used cache with hit/miss counters.
+
+    With ttl (seconds) set, entries older than ttl are treated as misses.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+class SharedCacheStore:
+    """SQLite-backed cache shared by every uvicorn worker on the host.
+
+    Values are JSON documents with a wall-clock expiry. Rows beyond maxsize
+    are pruned, oldest first, every prune_every writes. Calls block on
+    SQLite, so async code should run them with asyncio.to_thread.
+    """
+
+    def __init__(self, path, ttl, maxsize, prune_every=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.prune_every = prune_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A cache can lose its last writes on power loss; WAL keeps it consistent without an fsync per put
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize,)
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# Match results keyed by profile, skill set, experience and catalog version
+MATCH_CACHE_TTL = float(os.environ.get("MATCH_CACHE_TTL_SECONDS", "300"))
+MATCH_CACHE = LRUCache(maxsize=int(os.environ.get("MATCH_CACHE_SIZE", "4096")), ttl=MATCH_CACHE_TTL)
+MATCH_CACHE_SHARED = (
+    SharedCacheStore(
+        os.environ["MATCH_CACHE_PATH"],
+        ttl=MATCH_CACHE_TTL,
+        maxsize=int(os.environ.get("MATCH_CACHE_SHARED_SIZE", "100000"))
+    )
+    if os.environ.get("MATCH_CACHE_PATH") else None
+)
+
+def match_cache_key(profile_id, skills, experience_years, catalog, mode, *options):
+    """Cache key for a match request; any catalog mutation changes catalog.version.
+
+    The TF-IDF model only affects semantic modes, so skills-mode keys leave it
+    out and are shared by workers whatever their fit.
+    """
+    skills_hash = hashlib.sha1("\n".join(sorted({skill.lower() for skill in skills})).encode()).hexdigest()
+    text_model_id = catalog.text_model_id if MATCH_MODE_WEIGHTS[mode] > 0 else ""
+    return ":".join(str(part) for part in (
+        profile_id, skills_hash, experience_years, catalog.version, text_model_id, mode, *options
+    ))
+
+# Skill-gap rankings keyed by catalog version, skill set and experience
+SKILL_GAP_TOP_N = int(os.environ.get("SKILL_GAP_TOP_N", "20"))
+SKILL_GAP_CACHE = LRUCache(maxsize=int(os.environ.get("SKILL_GAP_CACHE_SIZE", "4096")))
+
+# Parsed resumes by content hash: in-process first, then the resume_parses collection
+PARSE_CACHE = LRUCache(maxsize=int(os.environ.get("RESUME_PARSE_CACHE_SIZE", "1024")))
+RESUME_DEDUP_MODE = os.environ.get("RESUME_DEDUP_MODE", "link")  # "reuse" or "link"
+
+async def get_cached_parse(content_hash):
+    """Parsed fields for previously uploaded content, or None"""
+    parsed = PARSE_CACHE.get(content_hash)
+    if parsed is None:
+        parsed = await db.resume_parses.find_one({"content_hash": content_hash}, {"_id": 0})
+        if parsed is not None:
+            PARSE_CACHE.put(content_hash, parsed)
+    return parsed
+
+def parse_record(content_hash, parsed, profile_id):
+    """resume_parses document for a parse result; profiles created from the same content share its text blob"""
+    return {
+        "content_hash": content_hash,
+        "profile_id": profile_id,
+        "name": parsed["name"],
+        "email": parsed["email"],
+        "skills": parsed["skills"],
+        "experience_years": parsed["experience_years"],
+        "timestamp": datetime.utcnow(),
+    }
+
+# Out-of-line storage for resume text and original files
+STORE_ORIGINAL_FILES = os.environ.get("STORE_ORIGINAL_FILES", "false").lower() == "true"
+BLOB_COMPRESSION_LEVEL = 6
+
+def blob_document(kind, stored, **metadata):
+    """resume_blobs document for zlib-compressed content"""
+    return {
+        "kind": kind,
+        "encoding": "zlib",
+        "data": Binary(stored),
+        "stored_size": len(stored),
+        "timestamp": datetime.utcnow(),
+        **metadata,
+    }
+
+async def store_blob(blob_id, kind, data, compressed=False, **metadata):
+    """Save zlib-compressed content in resume_blobs once; identical content shares one blob"""
+    stored = data if compressed else await asyncio.to_thread(zlib.compress, data, BLOB_COMPRESSION_LEVEL)
+    blob = blob_document(kind, stored, **metadata)
+    await db.resume_blobs.update_one({"_id": blob_id}, {"$setOnInsert": blob}, upsert=True)
+    return blob_id
+
+async def load_blob(blob_id):
+    """Decompressed blob content and its metadata document, or (None, None)"""
+    blob = await db.resume_blobs.find_one({"_id": blob_id})
+    if blob is None:
+        return None, None
+    return await asyncio.to_thread(zlib.decompress, blob["data"]), blob
+
+async def migrate_inline_raw_text(batch_size=500):
+    """Move raw_text stored on profile documents into the blob store.
+
+    Each profile gets raw_text_id and loses its inline copy; profiles with
+    identical text share one blob. Safe to re-run.
+    """
+    report = {"profiles_migrated": 0, "text_bytes": 0, "stored_bytes": 0}
+    query = {"raw_text": {"$exists": True}}
+    while True:
+        batch = await db.resume_profiles.find(
+            query, {"_id": 0, "id": 1, "raw_text": 1, "content_hash": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            return report
+        updates = []
+        for profile_doc in batch:
+            text = profile_doc.get("raw_text") or ""
+            if not text and profile_doc.get("content_hash"):
+                # Deduplicated uploads referenced the first profile's inline text
+                text = await get_profile_raw_text(profile_doc)
+            data = text.encode("utf-8")
+            blob_id = f"text:{profile_doc.get('content_hash') or hashlib.sha256(data).hexdigest()}"
+            compressed = await asyncio.to_thread(zlib.compress, data, BLOB_COMPRESSION_LEVEL)
+            await store_blob(blob_id, "text", compressed, compressed=True, size=len(data))
+            updates.append((profile_doc["id"], blob_id))
+            report["text_bytes"] += len(data)
+            report["stored_bytes"] += len(compressed)
+        # Inline text is only dropped once every blob in the batch is written
+        for profile_id, blob_id in updates:
+            await db.resume_profiles.update_one(
+                {"id": profile_id}, {"$set": {"raw_text_id": blob_id}, "$unset": {"raw_text": ""}}
+            )
+        report["profiles_migrated"] += len(updates)
+
+async def get_profile_raw_text(profile_doc):
+    """Resume text for a profile, loaded lazily from the blob store.
+
+    Profile reads project raw_text away by default, so it is fetched here
+    only when a caller actually needs it. Profiles that predate the blob
+    store keep their text inline or share it through the deduplicated parse.
+    """
+    if not {"raw_text", "raw_text_id"} & profile_doc.keys():
+        profile_doc = await db.resume_profiles.find_one(
+            {"id": profile_doc["id"]}, {"_id": 0, "raw_text": 1, "raw_text_id": 1, "content_hash": 1}
+        ) or {}
+    if profile_doc.get("raw_text_id"):
+        data, _ = await load_blob(profile_doc["raw_text_id"])
+        return data.decode("utf-8") if data is not None else ""
+    if profile_doc.get("raw_text") or not profile_doc.get("content_hash"):
+        return profile_doc.get("raw_text", "")
+    parsed = await get_cached_parse(profile_doc["content_hash"])
+    if parsed is None:
+        return ""
+    source = await db.resume_profiles.find_one(
+        {"id": parsed["profile_id"]}, {"_id": 0, "raw_text": 1, "raw_text_id": 1}
+    )
+    if source and source.get("raw_text_id"):
+        data, _ = await load_blob(source["raw_text_id"])
+        return data.decode("utf-8") if data is not None else ""
+    return source.get("raw_text", "") if source else ""
+
+# Resume parsing pool
+def parse_resume(filename, source):
+    """Extract text and profile fields from an uploaded resume.
+
+    source is the upload as bytes or the path of its spooled temp file.
+    Experience is extracted chunk by chunk while the text is read; skills
+    are matched once on the joined text, since a chunk can end mid-word
+    (TXT blocks are cut every UPLOAD_CHUNK_BYTES). Runs inside the parse
+    pool, so it must stay a picklable top-level function and only raise
+    picklable exceptions.
+    """
+    scanner = ResumeChunkScanner()
+    chunks = []
+    # Stage timings are returned for the parent process to record
+    timings = dict.fromkeys(("extract_text", "skills", "experience"), 0.0)
+    reader = iter_resume_chunks(filename, source)
+    while True:
+        started = time.perf_counter()
+        chunk = next(reader, None)
+        timings["extract_text"] += time.perf_counter() - started
+        if chunk is None:
+            break
+        chunks.append(chunk)
+        started = time.perf_counter()
+        scanner.feed_experience(chunk)
+        timings["experience"] += time.perf_counter() - started
+    text = "".join(chunks)
+    text_bytes = text.encode("utf-8")
+    
+    started = time.perf_counter()
+    skills = SKILL_MATCHER.find_all(text)
+    timings["skills"] = time.perf_counter() - started
+    started = time.perf_counter()
+    name, email = extract_basic_info(text)
+    timings["basic_info"] = time.perf_counter() - started
+    started = time.perf_counter()
+    text_blob = zlib.compress(text_bytes, BLOB_COMPRESSION_LEVEL)
+    timings["compress_text"] = time.perf_counter() - started
+    return {
+        # The text only travels back compressed, ready for the blob store
+        "text_blob": text_blob,
+        "text_size": len(text_bytes),
+        "name": name,
+        "email": email,
+        "skills": skills,
+        "experience_years": scanner.experience_years(),
+        "timings": timings,
+    }
+
+WARMUP_RESUME = b"Alex Morgan\nalex.morgan@example.com\nPython developer with 5 years of experience.\n"
+
+def warm_parser():
+    """Import the PDF and DOCX readers and run one parse, in whichever process calls it"""
+    import PyPDF2  # noqa: F401
+    import docx  # noqa: F401
+
+    parse_resume("warmup.txt", WARMUP_RESUME)
+    return os.getpid()
+
+class ResumeParsePool:
+    """Bounded process pool that keeps resume parsing off the event loop.
+
+    At most max_pending parses may be queued or running at once; further
+    uploads are rejected with 503 instead of piling up. Each parse is given
+    timeout seconds before the request fails with 504, and the pool's worker
+    processes are then killed so the stuck parse cannot hold up later ones.
+    With workers=0 parsing runs on the default thread pool instead, where a
+    timed-out parse cannot be stopped and keeps its slot until it returns.
+    """
+
+    def __init__(self, workers, timeout, max_pending):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self):
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def parse(self, filename, file_content):
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Resume parser is busy, please retry shortly")
+        self.pending += 1
+        future = None
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            future = loop.run_in_executor(executor, parse_resume, filename, file_content)
+            with STAGE_LATENCY.labels("parse").time():
+                # shield: on timeout the parse keeps its slot until it has really ended
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except ResumeParseError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except asyncio.TimeoutError:
+            self._kill(executor)
+            raise HTTPException(status_code=504, detail=f"Timed out parsing {filename}")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile file); start a fresh pool for the next request
+            if self._executor is executor:
+                self._executor = None
+            raise HTTPException(status_code=500, detail=f"Parser crashed while reading {filename}")
+        finally:
+            if future is not None and not future.done():
+                future.add_done_callback(self._release)
+            else:
+                self.pending -= 1
+
+    def _release(self, future):
+        self.pending -= 1
+        if not future.cancelled():
+            future.exception()  # retrieved, so an abandoned failure is not logged as unhandled
+
+    def _kill(self, executor):
+        """Kill a process pool's workers, failing whatever they are running, and start afresh next time"""
+        if executor is None:
+            return
+        if self._executor is executor:
+            self._executor = None
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def warm_up(self):
+        """Start every worker and have it import the parsers and parse a short resume"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, warm_parser) for _ in range(max(1, self.workers))))
+
+    def shutdown(self):
+        # Killed rather than joined, so a parse still running cannot hold up interpreter exit
+        self._kill(self._executor)
+
+PARSE_POOL = ResumeParsePool(
+    workers=int(os.environ.get("PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    timeout=float(os.environ.get("PARSE_TIMEOUT_SECONDS", "30")),
+    max_pending=int(os.environ.get("PARSE_MAX_PENDING", "32")),
+)
+
+# Resume ingestion, shared by single and bulk uploads
+SUPPORTED_RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+async def parse_upload(filename, source, content_hash):
+    """Parse for uploaded content: the recorded parse of known content, else a fresh one.
+
+    Returns (parsed, duplicate). Fresh parses carry the compressed text for
+    save_profiles; with STORE_ORIGINAL_FILES the file itself is stored here,
+    before the caller releases its source.
+    """
+    cached = await get_cached_parse(content_hash)
+    if cached is not None:
+        return cached, True
+    parsed = await PARSE_POOL.parse(filename, source)
+    file_type = os.path.splitext(filename.lower())[1].lstrip(".")
+    for stage, seconds in parsed.pop("timings", {}).items():
+        STAGE_LATENCY.labels(f"extract_text_{file_type}" if stage == "extract_text" else stage).observe(seconds)
+    if STORE_ORIGINAL_FILES:
+        with open_resume_source(source) as stream:
+            file_bytes = stream.read()
+        await store_blob(f"file:{content_hash}", "file", file_bytes, filename=filename, size=len(file_bytes))
+    return parsed, False
+
+async def find_duplicate_profile(parsed):
+    """Profile originally created from a recorded parse, for on_duplicate=reuse"""
+    return await db.resume_profiles.find_one(
+        {"id": parsed["profile_id"]}, {"_id": 0, "text_vector": 0, "raw_text": 0}
+    )
+
+def new_profile(parsed, content_hash):
+    """Profile for a parse; the text lives in the blob store, shared by duplicate uploads"""
+    return ResumeProfile(
+        name=parsed["name"],
+        email=parsed["email"],
+        skills=parsed["skills"],
+        experience_years=parsed["experience_years"],
+        education="Extracted from resume",  # Could be enhanced
+        certifications=[],  # Could be enhanced
+        content_hash=content_hash,
+        raw_text_id=f"text:{content_hash}",
+        file_id=f"file:{content_hash}" if STORE_ORIGINAL_FILES else None
+    )
+
+async def save_profiles(entries):
+    """Write profiles with their text blobs and parse records, one round trip per collection.
+
+    entries are (profile, parsed, duplicate) triples. Duplicates already
+    share a stored parse; for fresh parses the text blob is written before
+    the profile and the parse record after it, as for single uploads.
+    """
+    fresh = {}
+    for profile, parsed, duplicate in entries:
+        if not duplicate:
+            # Identical files in one batch keep the first profile's parse
+            fresh.setdefault(profile.content_hash, (profile, parsed))
+    if fresh:
+        await db.resume_blobs.bulk_write([
+            UpdateOne(
+                {"_id": profile.raw_text_id},
+                {"$setOnInsert": blob_document("text", parsed["text_blob"], size=parsed["text_size"])},
+                upsert=True
+            )
+            for profile, parsed in fresh.values()
+        ], ordered=False)
+    await db.resume_profiles.insert_many([profile.dict(exclude={"raw_text"}) for profile, _, _ in entries])
+    for profile, _, _ in entries:
+        PROFILE_INDEX.add(profile.id, profile.skills, profile.experience_years, profile.timestamp)
+    if fresh:
+        records = [parse_record(content_hash, parsed, profile.id) for content_hash, (profile, parsed) in fresh.items()]
+        # $setOnInsert keeps the first record if the same file is uploaded concurrently
+        await db.resume_parses.bulk_write([
+            UpdateOne({"content_hash": record["content_hash"]}, {"$setOnInsert": record}, upsert=True)
+            for record in records
+        ], ordered=False)
+        for record in records:
+            PARSE_CACHE.put(record["content_hash"], record)
+
+async def ingest_upload(filename, source, content_hash, on_duplicate, profile_id=None):
+    """Parse an upload and save its profile, returning the upload response body"""
+    # Extract text and parse resume in the worker pool, unless the content is known
+    parsed, duplicate = await parse_upload(filename, source, content_hash)
+    
+    if duplicate and on_duplicate == "reuse":
+        existing = await find_duplicate_profile(parsed)
+        if existing:
+            return {
+                "success": True,
+                "profile": ResumeProfile(**existing).dict(exclude={"raw_text"}),
+                "duplicate": True,
+                "message": f"Resume already uploaded. Found {len(existing['skills'])} skills."
+            }
+    
+    # Create profile and save to database
+    profile = new_profile(parsed, content_hash)
+    if profile_id is not None:
+        profile.id = profile_id
+    await save_profiles([(profile, parsed, duplicate)])
+    
+    return {
+        "success": True,
+        "profile": profile.dict(exclude={"raw_text"}),
+        "duplicate": duplicate,
+        "message": f"Resume parsed successfully! Found {len(profile.skills)} skills."
+    }
+
+# Bulk resume upload
+MAX_BULK_FILES = int(os.environ.get("MAX_BULK_FILES", "5000"))
+MAX_BULK_ARCHIVE_BYTES = int(os.environ.get("MAX_BULK_ARCHIVE_BYTES", str(500 * 1024 * 1024)))
+# Kept below PARSE_MAX_PENDING so single uploads still get a parser slot during a bulk run
+BULK_PARSE_CONCURRENCY = max(1, min(
+    int(os.environ.get("BULK_PARSE_CONCURRENCY", str(max(1, PARSE_POOL.workers) * 2))),
+    PARSE_POOL.max_pending - 1
+))
+# Pause before a bulk file retries a parser that is busy with other uploads
+BULK_PARSE_RETRY_SECONDS = float(os.environ.get("BULK_PARSE_RETRY_SECONDS", "0.25"))
+BULK_INSERT_BATCH = int(os.environ.get("BULK_INSERT_BATCH", "200"))
+
+def iter_zip_resumes(source, max_entry_bytes=None):
+    """Yield (filename, content, sha256, error) for each file in a ZIP archive.
+
+    Entries that are not resumes or exceed the per-file upload cap are
+    reported with an error instead of being read; declared sizes are checked
+    before decompressing anything.
+    """
+    max_entry_bytes = MAX_UPLOAD_BYTES if max_entry_bytes is None else max_entry_bytes
+    try:
+        with open_resume_source(source) as stream, zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                    continue
+                if not name.lower().endswith(SUPPORTED_RESUME_EXTENSIONS):
+                    yield name, None, None, "Only PDF, DOCX, and TXT files are supported"
+                elif info.file_size > max_entry_bytes:
+                    yield name, None, None, f"File exceeds the {max_entry_bytes} byte upload limit"
+                else:
+                    content = archive.read(info)
+                    yield name, content, hashlib.sha256(content).hexdigest(), None
+    except zipfile.BadZipFile as e:
+        yield "", None, None, f"Could not read ZIP archive: {e}"
+
+async def iter_bulk_entries(uploads):
+    """Resumes in spooled uploads as (filename, source, content_hash, error), expanding ZIP archives"""
+    for filename, source, content_hash, error in uploads:
+        if error is None and filename.lower().endswith(".zip"):
+            entries = iter_zip_resumes(source)
+            # Decompression and hashing run off the event loop, one entry at a time
+            while (entry := await asyncio.to_thread(next, entries, None)) is not None:
+                name, content, entry_hash, entry_error = entry
+                yield f"{filename}/{name}" if name else filename, content, entry_hash, entry_error
+            release_upload(source)
+        else:
+            yield filename, source, content_hash, error
+
+async def ingest_resumes(entries, on_duplicate):
+    """Parse and save bulk upload entries, yielding one result per file as it finishes.
+
+    At most BULK_PARSE_CONCURRENCY files are parsed at once. Parsed profiles
+    are written with save_profiles in batches of whatever has finished since
+    the last write, up to BULK_INSERT_BATCH, so results keep streaming while
+    slow files are still parsing. A failing file only produces an error
+    result for that file; a file turned away by a busy parser (other bulk
+    runs or single uploads hold every slot) waits and retries instead.
+    """
+    semaphore = asyncio.Semaphore(BULK_PARSE_CONCURRENCY)
+    finished = asyncio.Queue()
+    tasks = set()
+
+    def failure(filename, error):
+        return {"filename": filename, "success": False, "error": error}
+
+    async def parse_one(filename, source, content_hash):
+        try:
+            while True:
+                try:
+                    parsed, duplicate = await parse_upload(filename, source, content_hash)
+                    break
+                except HTTPException as e:
+                    if e.status_code != 503:
+                        raise
+                    await asyncio.sleep(BULK_PARSE_RETRY_SECONDS)
+            if duplicate and on_duplicate == "reuse":
+                existing = await find_duplicate_profile(parsed)
+                if existing:
+                    finished.put_nowait(("result", {
+                        "filename": filename, "success": True, "profile_id": existing["id"],
+                        "duplicate": True, "skills_found": len(existing["skills"])
+                    }))
+                    return
+            finished.put_nowait(("parsed", (filename, new_profile(parsed, content_hash), parsed, duplicate)))
+        except HTTPException as e:
+            finished.put_nowait(("result", failure(filename, e.detail)))
+        except Exception as e:
+            logger.error(f"Error processing resume {filename}: {str(e)}")
+            finished.put_nowait(("result", failure(filename, f"Error processing resume: {str(e)}")))
+        finally:
+            release_upload(source)
+            semaphore.release()
+
+    async def feed():
+        count = 0
+        try:
+            async for filename, source, content_hash, error in entries:
+                count += 1
+                if count > MAX_BULK_FILES:
+                    release_upload(source)
+                    finished.put_nowait(("result", failure(filename, f"At most {MAX_BULK_FILES} files per bulk upload")))
+                    continue
+                if error is not None:
+                    finished.put_nowait(("result", failure(filename, error)))
+                    continue
+                await semaphore.acquire()
+                task = asyncio.create_task(parse_one(filename, source, content_hash))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.error(f"Error reading bulk upload: {str(e)}")
+            finished.put_nowait(("result", failure("", f"Error reading bulk upload: {str(e)}")))
+        finally:
+            finished.put_nowait(("done", None))
+
+    feeder = asyncio.create_task(feed())
+    try:
+        done = False
+        while not done:
+            batch = []
+            item = await finished.get()
+            while True:
+                kind, payload = item
+                if kind == "done":
+                    done = True
+                elif kind == "result":
+                    yield payload
+                else:
+                    batch.append(payload)
+                if done or len(batch) >= BULK_INSERT_BATCH or finished.empty():
+                    break
+                item = finished.get_nowait()
+            if not batch:
+                continue
+            try:
+                await save_profiles([(profile, parsed, duplicate) for _, profile, parsed, duplicate in batch])
+            except Exception as e:
+                logger.error(f"Error saving bulk upload profiles: {str(e)}")
+                for filename, *_ in batch:
+                    yield failure(filename, f"Error saving profile: {str(e)}")
+                continue
+            for filename, profile, _, duplicate in batch:
+                yield {
+                    "filename": filename, "success": True, "profile_id": profile.id,
+                    "duplicate": duplicate, "skills_found": len(profile.skills)
+                }
+    finally:
+        feeder.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+# Background resume processing.
+# Tasks live in the resume_tasks collection and the uploaded file in
+# resume_blobs, so queued work survives restarts. Every server process runs
+# TASK_WORKERS workers that claim tasks by priority with a lease; a task
+# whose worker died is picked up again once its lease expires.
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", "2"))
+TASK_MAX_BACKLOG = int(os.environ.get("TASK_MAX_BACKLOG", "10000"))
+TASK_MAX_ATTEMPTS = int(os.environ.get("TASK_MAX_ATTEMPTS", "3"))
+# Must outlast PARSE_TIMEOUT_SECONDS so a live worker never loses its lease
+TASK_LEASE_SECONDS = float(os.environ.get("TASK_LEASE_SECONDS", "120"))
+TASK_POLL_SECONDS = float(os.environ.get("TASK_POLL_SECONDS", "2"))
+TASK_RETRY_BACKOFF_SECONDS = 5.0
+TASK_PRIORITY_RANGE = (0, 9)
+TASK_ACTIVE_STATES = ["queued", "running"]
+TASK_VIEW_PROJECTION = {"_id": 0, "blob_id": 0, "lease_until": 0, "available_at": 0}
+task_wakeup = None
+task_workers = []
+
+async def enqueue_resume_task(filename, source, content_hash, on_duplicate, priority):
+    """Queue a spooled upload for background processing; 202 with the task id"""
+    if not TASK_PRIORITY_RANGE[0] <= priority <= TASK_PRIORITY_RANGE[1]:
+        raise HTTPException(status_code=400, detail=f"priority must be between {TASK_PRIORITY_RANGE[0]} and {TASK_PRIORITY_RANGE[1]}")
+    if await db.resume_tasks.count_documents({"status": {"$in": TASK_ACTIVE_STATES}}) >= TASK_MAX_BACKLOG:
+        raise HTTPException(status_code=503, detail="Resume processing backlog is full, please retry later")
+    with open_resume_source(source) as stream:
+        file_bytes = stream.read()
+    task_id = str(uuid.uuid4())
+    blob_id = await store_blob(f"upload:{task_id}", "upload", file_bytes, filename=filename, size=len(file_bytes))
+    now = datetime.utcnow()
+    task = {
+        "id": task_id,
+        "status": "queued",
+        "stage": "queued",
+        "priority": priority,
+        "attempts": 0,
+        "filename": filename,
+        "content_hash": content_hash,
+        "on_duplicate": on_duplicate,
+        "blob_id": blob_id,
+        # Fixed up front so a retried task cannot create a second profile
+        "profile_id": str(uuid.uuid4()),
+        "created_at": now,
+        "updated_at": now,
+        "available_at": now,
+    }
+    await db.resume_tasks.insert_one(task)
+    if task_wakeup is not None:
+        task_wakeup.set()
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "task_id": task_id,
+        "status": "queued",
+        "status_url": f"/api/tasks/{task_id}"
+    })
+
+async def claim_resume_task(worker_id):
+    """Lease the highest-priority runnable task, including ones whose lease expired"""
+    now = datetime.utcnow()
+    return await db.resume_tasks.find_one_and_update(
+        {"$or": [
+            {"status": "queued", "available_at": {"$lte": now}},
+            {"status": "running", "lease_until": {"$lt": now}},
+        ]},
+        {
+            "$set": {"status": "running", "stage": "parsing", "worker": worker_id,
+                     "lease_until": now + timedelta(seconds=TASK_LEASE_SECONDS),
+                     "updated_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("priority", -1), ("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+async def finish_resume_task(task, status, **fields):
+    await db.resume_tasks.update_one(
+        {"id": task["id"]},
+        {"$set": {"status": status, "stage": "done", "updated_at": datetime.utcnow(), **fields},
+         "$unset": {"lease_until": "", "worker": ""}}
+    )
+    await db.resume_blobs.delete_one({"_id": task["blob_id"]})
+
+async def run_resume_task(task):
+    """Process one claimed task; transient failures are retried with backoff"""
+    try:
+        if task["attempts"] > TASK_MAX_ATTEMPTS:
+            await finish_resume_task(task, "failed", error="Worker was lost too many times while processing")
+            return
+        saved = await db.resume_profiles.find_one({"id": task["profile_id"]}, {"_id": 0, "text_vector": 0, "raw_text": 0})
+        if saved is None:
+            file_bytes, _ = await load_blob(task["blob_id"])
+            if file_bytes is None:
+                await finish_resume_task(task, "failed", error="Uploaded file is no longer available")
+                return
+            result = await ingest_upload(
+                task["filename"], file_bytes, task["content_hash"], task["on_duplicate"], profile_id=task["profile_id"]
+            )
+        else:
+            # The profile was written before the previous attempt could record it
+            result = {
+                "success": True,
+                "profile": ResumeProfile(**saved).dict(exclude={"raw_text"}),
+                "duplicate": False,
+                "message": f"Resume parsed successfully! Found {len(saved['skills'])} skills."
+            }
+        await finish_resume_task(task, "succeeded", result=result, error=None)
+    except Exception as e:
+        status_code = e.status_code if isinstance(e, HTTPException) else 500
+        error = e.detail if isinstance(e, HTTPException) else f"Error processing resume: {str(e)}"
+        if status_code < 500 or task["attempts"] >= TASK_MAX_ATTEMPTS:
+            logger.error(f"Resume task {task['id']} failed: {error}")
+            await finish_resume_task(task, "failed", error=error, status_code=status_code)
+            return
+        retry_at = datetime.utcnow() + timedelta(seconds=TASK_RETRY_BACKOFF_SECONDS * 2 ** (task["attempts"] - 1))
+        await db.resume_tasks.update_one(
+            {"id": task["id"]},
+            {"$set": {"status": "queued", "stage": "queued", "error": error,
+                      "available_at": retry_at, "updated_at": datetime.utcnow()},
+             "$unset": {"lease_until": "", "worker": ""}}
+        )
+
+async def resume_task_worker(worker_id):
+    """Claim and run tasks until cancelled, sleeping while the queue is empty"""
+    while True:
+        try:
+            task = await claim_resume_task(worker_id)
+        except Exception as e:
+            logger.error(f"Error claiming resume task: {str(e)}")
+            task = None
+        if task is None:
+            task_wakeup.clear()
+            try:
+                await asyncio.wait_for(task_wakeup.wait(), TASK_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        try:
+            await run_resume_task(task)
+        except Exception as e:
+            # Left running; the lease expiry hands it to another attempt
+            logger.error(f"Error updating resume task {task['id']}: {str(e)}")
+
+def start_task_workers():
+    global task_wakeup
+    task_wakeup = asyncio.Event()
+    worker_prefix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    task_workers.extend(
+        asyncio.create_task(resume_task_worker(f"{worker_prefix}-{n}")) for n in range(TASK_WORKERS)
+    )
+
+# Job catalog scoring
+def parse_salary_range(salary_range):
+    """Numeric (min, max) salary from strings like "$120k - $150k"; (None, None) if absent"""
+    amounts = [
+        float(number.replace(',', '')) * (1000 if suffix else 1)
+        for number, suffix in re.findall(r'(\d[\d,]*(?:\.\d+)?)\s*([kK]?)', salary_range or "")
+    ]
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+# JobMatch fields that depend only on the posting, in response order
+JOB_STATIC_FIELDS = (
+    "id", "title", "company", "required_skills", "experience_required",
+    "description", "location", "salary_range",
+)
+
+def round_scores(values):
+    """round(value, 1) for every element, matching Python's rounding exactly"""
+    # np.round scales by 10 first, so a value just above a half (67.65 is 67.650000000000006) can land
+    # on the half and round down. value * 10 is formed as value * 8 + value * 2, both exact, and the
+    # error of that sum (TwoSum) decides the sums that land exactly on a half.
+    values = np.asarray(values, dtype=np.float64)
+    high, low = values * 8, values * 2
+    scaled = high + low
+    low_part = scaled - high
+    error = (high - (scaled - low_part)) + (low - low_part)
+    floor = np.floor(scaled)
+    tie = scaled - floor == 0.5
+    rounded = np.where(tie & (error > 0), floor + 1, np.where(tie & (error < 0), floor, np.rint(scaled)))
+    return rounded / 10
+
+def experience_factors(experience_years, experience_required):
+    """Score multiplier for candidate experience against job requirements (vectorized)"""
+    experience_required = np.asarray(experience_required)
+    return np.where(
+        experience_years < experience_required, 0.8,  # Reduce score if under-experienced
+        np.where(experience_years > experience_required + 2, 1.1, 1.0)  # Boost score if over-qualified
+    )
+
+def top_k_rows(scores, k=None):
+    """Return row indices of the k best scores, highest first, ties in catalog order"""
+    n = len(scores)
+    if k is None or k >= n:
+        rows = np.arange(n)
+    elif k <= 0:
+        return np.arange(0)
+    else:
+        rows = np.argpartition(-scores, k - 1)[:k]
+        # argpartition breaks ties arbitrarily; keep the earliest rows at the cut-off
+        threshold = scores[rows].min()
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        rows = np.concatenate([above, ties])
+    return rows[np.lexsort((rows, -scores[rows]))]
+
+class JobCatalog:
+    """Job postings as a sparse job x skill matrix, scored against a candidate in bulk"""
+
+    def __init__(self, jobs=(), vectorizer=None, text_model_id=None, text_fit_size=None, version=None):
+        self.jobs = []
+        self.row_index = {}
+        self.skill_index = {}
+        self.postings = {}  # canonical skill -> rows, so a candidate is scored against sharing jobs only
+        self._row_skills = []
+        self._row_text = []
+        self._job_detail = []
+        self._matrix = None
+        self._text_matrix = None
+        self.ann_index = None  # large snapshots only; see JobEmbeddingIndex
+        self.version = 0  # bumped on every add or remove, invalidating caches keyed on it
+        jobs = list(jobs)
+        self.vectorizer = vectorizer
+        self.text_model_id = text_model_id
+        self.text_fit_size = text_fit_size if text_fit_size is not None else len(jobs)
+        # TF-IDF is fit once per snapshot; later postings, and snapshots built with the same vectorizer,
+        # reuse its vocabulary
+        if self.vectorizer is None and jobs:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            self.vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+            self.vectorizer.fit(self.job_text(job) for job in jobs)
+            self.text_model_id = self.text_model_fingerprint(self.vectorizer)
+            self.text_fit_size = len(jobs)
+        text_rows = self.vectorizer.transform([self.job_text(job) for job in jobs]) if jobs else None
+        for row, job in enumerate(jobs):
+            self.add_job(job, text_rows[row])
+        if version is not None:
+            self.version = version
+
+    @staticmethod
+    def text_model_fingerprint(vectorizer):
+        """Id of a fitted TF-IDF model, the same in every worker that fits the same postings"""
+        digest = hashlib.sha1("\n".join(sorted(vectorizer.vocabulary_)).encode())
+        digest.update(vectorizer.idf_.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def job_text(job):
+        """Text fed to the TF-IDF model for a posting"""
+        return " ".join([job["title"], job["description"], " ".join(job["required_skills"])])
+
+    def __len__(self):
+        return len(self.row_index)
+
+    def __iter__(self):
+        return (job for job in self.jobs if job is not None)
+
+    def get(self, job_id):
+        row = self.row_index.get(job_id)
+        return None if row is None else self.jobs[row]
+
+    def add_job(self, job, text_row=None):
+        """Add a posting, replacing any existing posting with the same id"""
+        if text_row is None and self.vectorizer is not None:
+            text_row = self.vectorizer.transform([self.job_text(job)])
+        if job["id"] in self.row_index:
+            self.remove_job(job["id"])
+        row = len(self.jobs)
+        skills = {skill.lower() for skill in job["required_skills"]}
+        salary_min, salary_max = parse_salary_range(job.get("salary_range", ""))
+        # URLs and the pre-serialized detail are built once per posting, not per response
+        job = {
+            **job,
+            "job_search_urls": generate_job_search_urls(job["title"], job["company"], job["location"]),
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+        }
+        self.jobs.append(job)
+        self._job_detail.append(self._serialize_detail(job))
+        self.row_index[job["id"]] = row
+        self._row_skills.append(np.array(
+            [self.skill_index.setdefault(skill, len(self.skill_index)) for skill in skills], dtype=np.int32
+        ))
+        for skill in skills:
+            self.postings.setdefault(skill, set()).add(row)
+        if text_row is not None:
+            self._row_text.append((text_row.indices.astype(np.int32), text_row.data.astype(np.float32)))
+        else:
+            self._row_text.append((np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)))
+        self._matrix = None
+        self._text_matrix = None
+        self.version += 1
+        return row
+
+    def remove_job(self, job_id):
+        """Remove a posting; returns False if it was not in the catalog"""
+        row = self.row_index.pop(job_id, None)
+        if row is None:
+            return False
+        for skill in {skill.lower() for skill in self.jobs[row]["required_skills"]}:
+            self.postings[skill].discard(row)
+        self.jobs[row] = None
+        self._job_detail[row] = None
+        self._row_skills[row] = np.zeros(0, dtype=np.int32)
+        self._row_text[row] = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+        # The row stays as a tombstone; the matrices are rebuilt lazily without it
+        self._matrix = None
+        self._text_matrix = None
+        self.version += 1
+        return True
+
+    def copy(self):
+        """Snapshot to add or remove postings on without affecting this one.
+
+        Per-row data is shared, since add_job and remove_job replace entries
+        rather than mutating them; the containers and posting sets are copied.
+        """
+        other = JobCatalog.__new__(JobCatalog)
+        other.__dict__.update(self.__dict__)
+        other.jobs = list(self.jobs)
+        other.row_index = dict(self.row_index)
+        other.skill_index = dict(self.skill_index)
+        other.postings = {skill: set(rows) for skill, rows in self.postings.items()}
+        other._row_skills = list(self._row_skills)
+        other._row_text = list(self._row_text)
+        other._job_detail = list(self._job_detail)
+        return other
+
+    def _build_matrix(self):
+        row_skills = self._row_skills
+        indptr = np.zeros(len(row_skills) + 1, dtype=np.int64)
+        np.cumsum([len(cols) for cols in row_skills], out=indptr[1:])
+        indices = np.concatenate(row_skills) if row_skills else np.zeros(0, dtype=np.int32)
+        self._matrix = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(row_skills), len(self.skill_index))
+        )
+        self._skill_counts = np.diff(indptr).astype(np.float32)
+        # Live postings requiring each skill column
+        self._skill_job_counts = np.bincount(indices, minlength=len(self.skill_index))
+        self._skill_names = np.empty(len(self.skill_index), dtype=object)
+        for skill, col in self.skill_index.items():
+            self._skill_names[col] = skill
+        self._experience_required = np.array(
+            [job["experience_required"] if job is not None else 0 for job in self.jobs], dtype=np.float32
+        )
+
+    @property
+    def text_matrix(self):
+        """L2-normalized TF-IDF rows, one per catalog row"""
+        if self._text_matrix is None:
+            lengths = [len(indices) for indices, _ in self._row_text]
+            indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            indices = np.concatenate([indices for indices, _ in self._row_text]) if lengths else np.zeros(0, dtype=np.int32)
+            data = np.concatenate([data for _, data in self._row_text]) if lengths else np.zeros(0, dtype=np.float32)
+            vocabulary_size = len(self.vectorizer.vocabulary_) if self.vectorizer is not None else 0
+            self._text_matrix = sp.csr_matrix((data, indices, indptr), shape=(len(lengths), vocabulary_size))
+        return self._text_matrix
+
+    def transform_text(self, text):
+        """TF-IDF vector of free text against the fitted catalog vocabulary"""
+        if self.vectorizer is None:
+            raise ValueError("Semantic matching is unavailable for an empty catalog")
+        return self.vectorizer.transform([text])
+
+    @property
+    def skill_matrix(self):
+        if self._matrix is None:
+            self._build_matrix()
+        return self._matrix
+
+    @property
+    def skill_counts(self):
+        if self._matrix is None:
+            self._build_matrix()
+        return self._skill_counts
+
+    @property
+    def experience_required(self):
+        if self._matrix is None:
+            self._build_matrix()
+        return self._experience_required
+
+    @property
+    def skill_job_counts(self):
+        if self._matrix is None:
+            self._build_matrix()
+        return self._skill_job_counts
+
+    @property
+    def skill_names(self):
+        """Skill name of each skill matrix column"""
+        if self._matrix is None:
+            self._build_matrix()
+        return self._skill_names
+
+    def skill_vector(self, skills):
+        """Binary vector over the catalog skill vocabulary"""
+        vector = np.zeros(len(self.skill_index), dtype=np.float32)
+        cols = [self.skill_index[skill] for skill in {skill.lower() for skill in skills} if skill in self.skill_index]
+        vector[cols] = 1.0
+        return vector
+
+    @staticmethod
+    def _fit_scores(overlap, skill_counts):
+        overlap = np.asarray(overlap, dtype=np.float64)
+        skill_counts = np.asarray(skill_counts, dtype=np.float64)
+        return round_scores(np.divide(overlap, skill_counts, out=np.zeros_like(overlap), where=skill_counts > 0) * 100)
+
+    @staticmethod
+    def _final_scores(fit, experience_years, experience_required):
+        final = np.minimum(fit * experience_factors(experience_years, experience_required), 100.0)
+        return round_scores(final)
+
+    def score_semantic(self, text_vector, skills, experience_years, semantic_weight=1.0):
+        """Blend TF-IDF cosine similarity with skill fit for every row.
+
+        text_vector is an L2-normalized TF-IDF row, so cosine similarity against
+        the whole catalog is a single sparse product. Returns (semantic, final)
+        where semantic is the raw similarity on a 0-100 scale.
+        """
+        semantic = round_scores((self.text_matrix @ text_vector.T).toarray().ravel().astype(np.float64) * 100)
+        fit = semantic
+        if semantic_weight < 1.0:
+            skill_fit = self._fit_scores(self.skill_matrix @ self.skill_vector(skills), self.skill_counts)
+            fit = semantic_weight * semantic + (1.0 - semantic_weight) * skill_fit
+        return semantic, self._final_scores(fit, experience_years, self.experience_required)
+
+    def score_candidates(self, skills, experience_years):
+        """Score only the rows sharing at least one skill with the candidate.
+
+        Candidate rows come from the union of the candidate's skill postings,
+        so the cost follows the candidate's skill fan-out, not catalog size.
+        Returns (rows, scores); every other row scores 0.
+        """
+        postings = [self.postings[skill] for skill in {skill.lower() for skill in skills} if self.postings.get(skill)]
+        if not postings:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        hits = np.concatenate([np.fromiter(rows, dtype=np.int64, count=len(rows)) for rows in postings])
+        rows, overlap = np.unique(hits, return_counts=True)
+        skill_counts = np.array([len(self._row_skills[row]) for row in rows], dtype=np.float32)
+        experience_required = np.array([self.jobs[row]["experience_required"] for row in rows], dtype=np.float32)
+        fit = self._fit_scores(overlap.astype(np.float32), skill_counts)
+        return rows, self._final_scores(fit, experience_years, experience_required)
+
+    def score_rows(self, rows, skills, experience_years, text_vector=None, semantic_weight=0.0):
+        """Exact scores for a subset of catalog rows.
+
+        The same fit, blend and experience adjustment as score/score_semantic,
+        restricted to rows. Returns (semantic, final) aligned with rows;
+        semantic is None unless a text_vector and a semantic_weight above zero
+        are given.
+        """
+        fit = self._fit_scores(self.skill_matrix[rows] @ self.skill_vector(skills), self.skill_counts[rows])
+        semantic = None
+        if text_vector is not None and semantic_weight > 0:
+            similarity = (self.text_matrix[rows] @ text_vector.T).toarray().ravel().astype(np.float64)
+            semantic = round_scores(similarity * 100)
+            fit = semantic if semantic_weight >= 1.0 else semantic_weight * semantic + (1.0 - semantic_weight) * fit
+        return semantic, self._final_scores(fit, experience_years, self.experience_required[rows])
+
+    def skill_gaps(self, skills, experience_years, top_n=20):
+        """Rank the skills a candidate lacks by the fit they would add to their top_n matches.
+
+        For each of the candidate's top_n jobs (see rank), learning one more
+        required skill raises that job's final score by a fixed amount, the
+        same for any of its missing skills. A skill's gain is that amount
+        summed over the top jobs that require it. Ties go to skills required
+        by more of those jobs, then by more of the catalog. Only jobs scoring
+        above zero count as matches; a candidate with none gets the skills
+        they lack ranked by catalog demand alone, with no fit gain. Returns
+        dicts with skill, fit_gain, matched_jobs_requiring and
+        catalog_jobs_requiring.
+        """
+        rows = np.array([row for row, _, _ in self.rank(skills, experience_years, top_n)], dtype=np.int64)
+        if not len(rows):
+            return self.demanded_skills(skills)
+        candidate = self.skill_vector(skills)
+        top_jobs = self.skill_matrix[rows]
+        overlap = top_jobs @ candidate
+        skill_counts = self.skill_counts[rows]
+        experience_required = self.experience_required[rows]
+        current = self._final_scores(self._fit_scores(overlap, skill_counts), experience_years, experience_required)
+        learned = self._final_scores(self._fit_scores(overlap + 1, skill_counts), experience_years, experience_required)
+        gain_per_job = (learned - current).astype(np.float64)
+
+        # Required-but-missing (job, skill) pairs of the top jobs
+        missing = sp.csc_matrix(top_jobs.multiply(1.0 - candidate))
+        missing.eliminate_zeros()
+        fit_gain = missing.T @ gain_per_job
+        jobs_requiring = np.diff(missing.indptr)
+        cols = np.flatnonzero(jobs_requiring)
+        if not len(cols):
+            return []
+        names = self.skill_names
+        demand = self.skill_job_counts[cols]
+        order = np.lexsort((names[cols], -demand, -jobs_requiring[cols], -np.round(fit_gain[cols], 1)))
+        return [
+            {
+                "skill": names[col],
+                "fit_gain": round(float(fit_gain[col]), 1),
+                "matched_jobs_requiring": int(jobs_requiring[col]),
+                "catalog_jobs_requiring": int(self.skill_job_counts[col]),
+            }
+            for col in cols[order]
+        ]
+
+    def demanded_skills(self, skills):
+        """Skills the candidate lacks, most required across the catalog first, in skill_gaps form"""
+        demand = self.skill_job_counts * (1.0 - self.skill_vector(skills))
+        cols = np.flatnonzero(demand)
+        names = self.skill_names
+        return [
+            {
+                "skill": names[col],
+                "fit_gain": 0.0,
+                "matched_jobs_requiring": 0,
+                "catalog_jobs_requiring": int(self.skill_job_counts[col]),
+            }
+            for col in cols[np.lexsort((names[cols], -demand[cols]))]
+        ]
+
+    def score_many(self, skills_list, experience_years_list, block_cells=4_000_000):
+        """Score many candidates at once as a profiles x jobs matrix product.
+
+        Candidates are processed in blocks so the dense profiles x jobs block
+        stays under block_cells entries. Yields one row of final scores per
+        candidate, in input order.
+        """
+        n_rows = self.skill_matrix.shape[0]
+        if not skills_list:
+            return
+        block_size = max(1, block_cells // max(n_rows, 1))
+        for start in range(0, len(skills_list), block_size):
+            block_skills = skills_list[start:start + block_size]
+            rows, cols = [], []
+            for i, skills in enumerate(block_skills):
+                for skill in {skill.lower() for skill in skills}:
+                    col = self.skill_index.get(skill)
+                    if col is not None:
+                        rows.append(i)
+                        cols.append(col)
+            candidates = sp.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                shape=(len(block_skills), len(self.skill_index))
+            )
+            overlap = (candidates @ self.skill_matrix.T).toarray()
+            fit = self._fit_scores(overlap, self.skill_counts[None, :])
+            experience = np.asarray(experience_years_list[start:start + block_size], dtype=np.float32)[:, None]
+            yield from self._final_scores(fit, experience, self.experience_required[None, :])
+
+    @staticmethod
+    def _serialize_detail(job):
+        """(JSON, ETag, offset of job_search_urls in the JSON) for a posting's static JobMatch fields"""
+        head = orjson.dumps({field: job[field] for field in JOB_STATIC_FIELDS})[:-1]
+        detail = head + b',"job_search_urls":' + orjson.dumps(job["job_search_urls"]) + b'}'
+        return detail, f'"{hashlib.sha256(detail).hexdigest()[:32]}"', len(head)
+
+    def job_detail(self, job_id):
+        """Pre-serialized static details and ETag of a posting, or None"""
+        row = self.row_index.get(job_id)
+        return None if row is None else self._job_detail[row][:2]
+
+    def _split_skills(self, row, candidate_skills_lower):
+        required_skills = self.jobs[row]["required_skills"]
+        matched_skills = [skill for skill in required_skills if skill.lower() in candidate_skills_lower]
+        missing_skills = [skill for skill in required_skills if skill.lower() not in candidate_skills_lower]
+        return matched_skills, missing_skills
+
+    def match_dicts(self, skills, ranked, fields=LEAN_MATCH_FIELDS):
+        """JobMatch-shaped dicts holding only the requested fields, for ranked (row, fit_score, semantic_score).
+
+        Values are taken from the catalog as-is rather than re-validated
+        through JobMatch; matched/missing skills are computed only when asked for.
+        """
+        candidate_skills_lower = {skill.lower() for skill in skills}
+        split = "matched_skills" in fields or "missing_skills" in fields
+        matches = []
+        for row, fit_score, semantic_score in ranked:
+            job = self.jobs[row]
+            computed = {
+                "fit_score": float(fit_score),
+                "semantic_score": None if semantic_score is None else float(semantic_score),
+            }
+            if split:
+                computed["matched_skills"], computed["missing_skills"] = self._split_skills(row, candidate_skills_lower)
+            matches.append({field: computed[field] if field in computed else job[field] for field in fields})
+        return matches
+
+    def rank(self, skills, experience_years, top_k=None, include_unmatched=False,
+             text_vector=None, semantic_weight=0.0, exact=False):
+        """Return (row, fit_score, semantic_score) tuples for the top_k best jobs.
+
+        Only jobs sharing a skill with the candidate are scored; zero-overlap
+        jobs are appended in catalog order when include_unmatched is set.
+        With a text_vector and a semantic_weight above zero, jobs are ranked
+        on the blended skill/TF-IDF score and any job with a non-zero score
+        counts as a candidate.
+
+        When the catalog has an ann_index and top_k is bounded, only the rows
+        it shortlists are scored, unless exact is set.
+        """
+        semantic = None
+        if self.ann_index is not None and top_k is not None and not exact:
+            rows = self.ann_index.candidates(self, skills, text_vector, semantic_weight)
+            semantic, scores = self.score_rows(rows, skills, experience_years, text_vector, semantic_weight)
+            keep = np.flatnonzero(scores > 0)
+            rows, scores = rows[keep], scores[keep]
+            semantic = None if semantic is None else semantic[keep]
+        elif text_vector is not None and semantic_weight > 0:
+            all_semantic, all_scores = self.score_semantic(text_vector, skills, experience_years, semantic_weight)
+            rows = np.flatnonzero(all_scores > 0)
+            scores, semantic = all_scores[rows], all_semantic[rows]
+        else:
+            rows, scores = self.score_candidates(skills, experience_years)
+        ranked = [(rows[i], scores[i], None if semantic is None else semantic[i]) for i in top_k_rows(scores, top_k)]
+        if include_unmatched and (top_k is None or len(ranked) < top_k):
+            scored = set(rows.tolist())
+            unmatched = []
+            for row, job in enumerate(self.jobs):
+                if top_k is not None and len(ranked) + len(unmatched) >= top_k:
+                    break
+                if job is not None and row not in scored:
+                    unmatched.append(row)
+            if unmatched:
+                unmatched = np.array(unmatched, dtype=np.int64)
+                # Zero unless the ann_index left a matching row out of its shortlist
+                unmatched_semantic, unmatched_scores = self.score_rows(
+                    unmatched, skills, experience_years, text_vector, semantic_weight
+                )
+                ranked += [
+                    (row, unmatched_scores[i], None if unmatched_semantic is None else unmatched_semantic[i])
+                    for i, row in enumerate(unmatched)
+                ]
+        return ranked
+
+    def match_json(self, skills, experience_years, top_k=None, include_unmatched=False,
+                   text_vector=None, semantic_weight=0.0, fields=LEAN_MATCH_FIELDS):
+        """(match count, JSON array of the selected match fields) for the top_k best jobs (see rank)"""
+        with STAGE_LATENCY.labels("scoring").time():
+            ranked = self.rank(skills, experience_years, top_k, include_unmatched, text_vector, semantic_weight)
+        with STAGE_LATENCY.labels("serialization").time():
+            if set(JOB_STATIC_FIELDS) <= set(fields):
+                return len(ranked), self.match_json_from_detail(skills, ranked, fields)
+            return len(ranked), orjson.dumps(self.match_dicts(skills, ranked, fields)).decode()
+
+    def match_json_from_detail(self, skills, ranked, fields):
+        """match_dicts serialized as a JSON array, for fields that include every static posting field.
+
+        Each match splices the scores and matched/missing skills into the
+        posting's pre-serialized detail, so descriptions and URLs are not
+        re-encoded per request.
+        """
+        include_urls = "job_search_urls" in fields
+        computed_fields = [field for field in fields if field not in JOB_STATIC_FIELDS and field != "job_search_urls"]
+        candidate_skills_lower = {skill.lower() for skill in skills}
+        split = "matched_skills" in fields or "missing_skills" in fields
+        matches = []
+        for row, fit_score, semantic_score in ranked:
+            detail, _, urls_at = self._job_detail[row]
+            computed = {
+                "fit_score": float(fit_score),
+                "semantic_score": None if semantic_score is None else float(semantic_score),
+            }
+            if split:
+                computed["matched_skills"], computed["missing_skills"] = self._split_skills(row, candidate_skills_lower)
+            # Static fields, then the computed ones, then the URLs: JobMatch field order
+            parts = [detail[:urls_at]]
+            if computed_fields:
+                parts.append(b"," + orjson.dumps({field: computed[field] for field in computed_fields})[1:-1])
+            parts.append(detail[urls_at:] if include_urls else b"}")
+            matches.append(b"".join(parts))
+        return (b"[" + b",".join(matches) + b"]").decode()
+
+# Approximate candidate retrieval for large catalogs
+ANN_MIN_JOBS = int(os.environ.get("ANN_MIN_JOBS", "200000"))  # smaller snapshots are always scored exactly
+ANN_DIMENSIONS = int(os.environ.get("ANN_DIMENSIONS", "64"))
+ANN_LISTS = int(os.environ.get("ANN_LISTS", "0"))  # 0: about sqrt(jobs)
+ANN_NPROBE = int(os.environ.get("ANN_NPROBE", "64"))
+ANN_CANDIDATES = int(os.environ.get("ANN_CANDIDATES", "2000"))
+ANN_SKILL_WEIGHT = float(os.environ.get("ANN_SKILL_WEIGHT", "2.0"))
+ANN_TRAIN_SAMPLE = int(os.environ.get("ANN_TRAIN_SAMPLE", "50000"))
+# top_k for /match-jobs requests without one while the catalog has an ann_index
+ANN_DEFAULT_TOP_K = int(os.environ.get("ANN_DEFAULT_TOP_K", "100"))
+ANN_KMEANS_ITERATIONS = 10
+
+class JobEmbeddingIndex:
+    """Inverted-file index over SVD-reduced job embeddings that shortlists rows for JobCatalog.rank"""
+
+    def __init__(self, catalog, dimensions=ANN_DIMENSIONS, lists=ANN_LISTS, nprobe=ANN_NPROBE,
+                 candidates=ANN_CANDIDATES, skill_weight=ANN_SKILL_WEIGHT, train_sample=ANN_TRAIN_SAMPLE, seed=0):
+        from sklearn.decomposition import TruncatedSVD
+
+        rng = np.random.default_rng(seed)
+        self.nprobe = nprobe
+        self.candidates_per_query = candidates
+        self.skill_weight = skill_weight
+        self.indexed_rows = len(catalog.jobs)
+        self.text_columns = catalog.text_matrix.shape[1]
+        self.skill_columns = len(catalog.skill_index)
+        rows = np.flatnonzero(catalog.skill_counts > 0)
+
+        features = self._job_features(catalog, rows)
+        sample = rng.choice(len(rows), min(train_sample, len(rows)), replace=False)
+        dimensions = max(1, min(dimensions, features.shape[1] - 1, len(sample) - 1))
+        self.svd = TruncatedSVD(n_components=dimensions, random_state=seed).fit(features[sample])
+        self.components = self.svd.components_.astype(np.float32)
+        embeddings = np.asarray(features @ self.components.T, dtype=np.float32)
+
+        # k-means over the embeddings partitions the postings into lists; a query probes the nprobe best
+        lists = lists or int(np.sqrt(len(rows)))
+        lists = max(1, min(lists, len(sample)))
+        self.centroids = self._kmeans(embeddings[sample], lists, rng)
+        assignment = self._assign(embeddings, self.centroids)
+        order = np.argsort(assignment, kind="stable")
+        self.list_offsets = np.zeros(lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=lists), out=self.list_offsets[1:])
+        # Embeddings stored list by list, so probing a list reads one contiguous slice
+        self.list_rows = rows[order]
+        self.embeddings = embeddings[order].astype(np.float16)
+
+    def _job_features(self, catalog, rows):
+        # [TF-IDF row, skill row / skill count]: its dot product with the query from embed_query is the
+        # blended fit score. Skills are scaled up by skill_weight here and down in the query, which keeps
+        # the product but gives them more say in the SVD.
+        skills = catalog.skill_matrix[rows]
+        skills = sp.diags(self.skill_weight / catalog.skill_counts[rows]) @ skills
+        return sp.hstack([catalog.text_matrix[rows], skills], format="csr", dtype=np.float32)
+
+    @staticmethod
+    def _assign(points, centroids, block=65536):
+        """Nearest centroid (Euclidean) of every point, in blocks to bound memory"""
+        half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+        return np.concatenate([
+            np.argmax(points[start:start + block] @ centroids.T - half_norms, axis=1)
+            for start in range(0, len(points), block)
+        ]) if len(points) else np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def _kmeans(cls, points, k, rng, iterations=ANN_KMEANS_ITERATIONS):
+        centroids = points[rng.choice(len(points), k, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = cls._assign(points, centroids)
+            counts = np.bincount(assignment, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, points)
+            filled = counts > 0
+            # Empty lists keep their previous centroid
+            centroids[filled] = sums[filled] / counts[filled, None]
+        return centroids
+
+    def embed_query(self, catalog, skills, text_vector=None, semantic_weight=0.0):
+        """Embedding of a candidate, on the same scale as the job embeddings"""
+        skill_part = catalog.skill_vector(skills)[:self.skill_columns] * ((1.0 - semantic_weight) / self.skill_weight)
+        query = self.components[:, self.text_columns:] @ skill_part
+        if text_vector is not None and semantic_weight > 0:
+            text_vector = text_vector.tocsr()
+            query += semantic_weight * (self.components[:, text_vector.indices] @ text_vector.data.astype(np.float32))
+        return query
+
+    def candidates(self, catalog, skills, text_vector=None, semantic_weight=0.0):
+        """Catalog rows worth scoring exactly for this candidate"""
+        query = self.embed_query(catalog, skills, text_vector, semantic_weight)
+        lists = len(self.centroids)
+        probe = np.arange(lists)
+        if self.nprobe < lists:
+            probe = np.argpartition(-(self.centroids @ query), self.nprobe - 1)[:self.nprobe]
+        starts, ends = self.list_offsets[probe], self.list_offsets[probe + 1]
+        positions = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        if len(positions) > self.candidates_per_query:
+            approximate = self.embeddings[positions].astype(np.float32) @ query
+            positions = positions[np.argpartition(-approximate, self.candidates_per_query - 1)[:self.candidates_per_query]]
+        rows = self.list_rows[positions]
+        # Postings added after the build are always shortlisted; removed ones score zero in rank and drop out
+        if len(catalog.jobs) > self.indexed_rows:
+            rows = np.concatenate([rows, np.arange(self.indexed_rows, len(catalog.jobs))])
+        return rows
+
+def prepare_job_catalog(catalog):
+    """Derive a snapshot's scoring structures before it is published.
+
+    Builds the skill and text matrices, which would otherwise be built by
+    the first request to need them, and the ann_index once the catalog
+    holds ANN_MIN_JOBS postings. An inherited index is kept until postings
+    added since it was built exceed CATALOG_REFIT_RATIO of the ones it covers.
+    """
+    catalog.skill_matrix
+    catalog.text_matrix
+    index = catalog.ann_index
+    if len(catalog) < ANN_MIN_JOBS:
+        catalog.ann_index = None
+    elif index is None or len(catalog.jobs) - index.indexed_rows > CATALOG_REFIT_RATIO * index.indexed_rows:
+        with STAGE_LATENCY.labels("ann_index_build").time():
+            catalog.ann_index = JobEmbeddingIndex(catalog)
+    return catalog
+
+def build_job_catalog(jobs, vectorizer=None, text_model_id=None, text_fit_size=None, version=None):
+    """JobCatalog snapshot with its scoring structures built (see prepare_job_catalog)"""
+    return prepare_job_catalog(JobCatalog(jobs, vectorizer, text_model_id, text_fit_size, version))
+
+def update_job_catalog(catalog, changed_ids, jobs, version):
+    """Snapshot of catalog with the changed postings replaced by jobs, or None when a full rebuild is due.
+
+    Ids in changed_ids without a document in jobs were deleted. A full rebuild
+    is due once removed rows or catalog growth since the TF-IDF fit exceed
+    CATALOG_REFIT_RATIO.
+    """
+    updated = catalog.copy()
+    for job_id in changed_ids - {job["id"] for job in jobs}:
+        updated.remove_job(job_id)
+    for job in jobs:
+        updated.add_job(job)
+    removed_rows = len(updated.jobs) - len(updated)
+    drift = abs(len(updated) - updated.text_fit_size)
+    if removed_rows > CATALOG_REFIT_RATIO * max(len(updated), 1) or drift > CATALOG_REFIT_RATIO * updated.text_fit_size:
+        return None
+    updated.version = version
+    return prepare_job_catalog(updated)
+
+# Live catalog snapshot; replaced wholesale by reload_job_catalog, never mutated in place
+JOB_CATALOG = JobCatalog()
+
+# Job catalog snapshot loading
+CATALOG_POLL_SECONDS = float(os.environ.get("CATALOG_POLL_SECONDS", "10"))
+CATALOG_REFIT_RATIO = float(os.environ.get("CATALOG_REFIT_RATIO", "0.2"))
+CATALOG_META_ID = "jobs"
+# Versions changing more postings than this are loaded with a full rebuild
+CATALOG_INCREMENTAL_MAX_CHANGES = int(os.environ.get("CATALOG_INCREMENTAL_MAX_CHANGES", "1000"))
+CATALOG_CHANGE_LOG_KEEP = 1000  # versions kept in catalog_changes
+catalog_reload_lock = asyncio.Lock()
+catalog_watcher = None
+
+async def get_catalog_version():
+    """Current catalog version from the catalog_meta collection"""
+    meta = await db.catalog_meta.find_one({"_id": CATALOG_META_ID})
+    return meta["version"] if meta else 0
+
+async def bump_catalog_version(job_ids=None):
+    """Record a catalog change; every worker reloads when it sees the new version.
+
+    job_ids lists the postings that were written or deleted, which lets
+    workers apply just those to their snapshot; None means any posting may
+    have changed.
+    """
+    meta = await db.catalog_meta.find_one_and_update(
+        {"_id": CATALOG_META_ID},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    version = meta["version"]
+    await db.catalog_changes.insert_one({
+        "version": version, "job_ids": None if job_ids is None else list(job_ids)
+    })
+    await db.catalog_changes.delete_many({"version": {"$lte": version - CATALOG_CHANGE_LOG_KEEP}})
+    return version
+
+async def get_catalog_changes(since, until):
+    """Ids of the postings changed after version since up to until, or None if they are not all logged"""
+    if until - since > CATALOG_INCREMENTAL_MAX_CHANGES:
+        return None
+    records = await db.catalog_changes.find(
+        {"version": {"$gt": since, "$lte": until}}, {"_id": 0}
+    ).to_list(None)
+    # A version bumped by another worker may not have its change record written yet
+    if len(records) != until - since or any(record["job_ids"] is None for record in records):
+        return None
+    changed = {job_id for record in records for job_id in record["job_ids"]}
+    return changed if len(changed) <= CATALOG_INCREMENTAL_MAX_CHANGES else None
+
+async def seed_job_catalog():
+    """Populate an empty jobs collection with the sample postings"""
+    if await db.jobs.count_documents({}, limit=1) == 0:
+        # Upserts, so workers starting together against an empty database do not collide
+        result = await db.jobs.bulk_write([
+            UpdateOne({"id": job["id"]}, {"$setOnInsert": dict(job)}, upsert=True) for job in SAMPLE_JOBS
+        ], ordered=False)
+        if result.upserted_count:
+            await bump_catalog_version()
+
+async def reload_job_catalog(force=False):
+    """Build a new catalog snapshot from MongoDB if the version moved, and swap it in.
+
+    The snapshot is built off the event loop and published with a single
+    assignment, so requests see either the old catalog or the new one. When
+    every version since the current snapshot logged its changed postings,
+    only those are read and applied to a copy of it (see update_job_catalog);
+    otherwise all postings are reloaded. The fitted TF-IDF vocabulary is
+    reused unless the catalog size has drifted by more than
+    CATALOG_REFIT_RATIO since it was fit.
+    """
+    global JOB_CATALOG
+    async with catalog_reload_lock:
+        current = JOB_CATALOG
+        version = await get_catalog_version()
+        if not force and version == current.version:
+            return current
+        changed = None
+        if not force and 0 < current.version < version:
+            changed = await get_catalog_changes(current.version, version)
+        if changed is not None:
+            jobs = await db.jobs.find({"id": {"$in": list(changed)}}, {"_id": 0}).to_list(None)
+            updated = await asyncio.to_thread(update_job_catalog, current, changed, jobs, version)
+            if updated is not None:
+                JOB_CATALOG = updated
+                logger.info(f"Updated job catalog to version {version} ({len(changed)} postings changed)")
+                return JOB_CATALOG
+        jobs = await db.jobs.find({}, {"_id": 0}).to_list(None)
+        text_model = (None, None, None)
+        if current.vectorizer is not None and abs(len(jobs) - current.text_fit_size) <= CATALOG_REFIT_RATIO * current.text_fit_size:
+            text_model = (current.vectorizer, current.text_model_id, current.text_fit_size)
+        JOB_CATALOG = await asyncio.to_thread(build_job_catalog, jobs, *text_model, version)
+        logger.info(f"Loaded job catalog version {version} with {len(JOB_CATALOG)} jobs")
+        return JOB_CATALOG
+
+async def watch_job_catalog():
+    """Poll the catalog version and hot-reload when another worker changes it"""
+    while True:
+        await asyncio.sleep(CATALOG_POLL_SECONDS)
+        try:
+            await reload_job_catalog()
+        except Exception as e:
+            logger.error(f"Error reloading job catalog: {str(e)}")
+
+# Bulk job import
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = 100  # rejected rows reported individually; the rest are only counted
+
+# Bytes that are not valid UTF-8, as decoded with errors="surrogateescape"
+UNDECODABLE_BYTES = re.compile('[\udc80-\udcff]')
+
+def iter_job_rows(text_stream, fmt):
+    """Yield (line_number, row) from a JSONL or CSV text stream; row is an exception if unparseable.
+
+    The stream should decode with errors="surrogateescape", so that a row
+    holding invalid UTF-8 is rejected on its own instead of ending the stream.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            if any(UNDECODABLE_BYTES.search(field) for field in [*row.keys(), *row.values()] if isinstance(field, str)):
+                yield reader.line_num, ValueError("not valid UTF-8")
+            else:
+                yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text_stream, 1):
+        if not line.strip():
+            continue
+        if UNDECODABLE_BYTES.search(line):
+            yield line_number, ValueError("not valid UTF-8")
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, e
+
+def coerce_job_row(row, unknown_skills=None):
+    """Validate a raw feed row into a job document with normalized skills.
+
+    Skills outside the vocabulary that cannot be mapped onto it are added to
+    unknown_skills when a set is given.
+    """
+    if isinstance(row, Exception):
+        raise ValueError(f"Malformed row: {str(row)}")
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+    # CSV rows with more fields than the header carry the extras under a None key
+    row = {key: value for key, value in row.items() if isinstance(key, str) and value not in (None, "")}
+    skills = row.get("required_skills", [])
+    if isinstance(skills, str):
+        skills = re.split(r'[;|,]', skills)
+    elif not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("required_skills must be a string or a list of strings")
+    row["required_skills"] = normalize_skills(skills, unknown_skills)
+    if not row["required_skills"]:
+        raise ValueError("required_skills is empty")
+    if "id" not in row and "title" in row and "company" in row:
+        # Stable id so re-importing the same feed updates rather than duplicates
+        key = "\n".join(str(row.get(field, "")) for field in ("title", "company", "location"))
+        row["id"] = "job_" + hashlib.sha1(key.encode()).hexdigest()[:16]
+    return JobPosting(**row).dict()
+
+async def import_jobs(rows, batch_size=None, refresh=True):
+    """Stream job rows into the jobs collection with batched unordered upserts.
+
+    rows yields (line_number, row) pairs as produced by iter_job_rows. Only one
+    batch is held in memory at a time; malformed rows are rejected and reported
+    without aborting the import. The catalog version is bumped once at the end
+    (and this worker's snapshot rebuilt when refresh is set) rather than per row;
+    if the import fails part-way, the version is still bumped for the batches
+    already written. Skills that could not be mapped onto the vocabulary are
+    listed under unknown_skills.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    report = {"rows_read": 0, "imported": 0, "rejected": 0, "errors": []}
+    unknown_skills = set()
+    start = time.perf_counter()
+
+    def reject(line_number, message):
+        report["rejected"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line_number, "error": message})
+
+    async def flush(batch):
+        try:
+            result = await db.jobs.bulk_write(
+                [ReplaceOne({"id": job["id"]}, job, upsert=True) for _, job in batch], ordered=False
+            )
+            report["imported"] += result.upserted_count + result.matched_count
+        except BulkWriteError as e:
+            details = e.details
+            report["imported"] += details.get("nUpserted", 0) + details.get("nMatched", 0)
+            for error in details.get("writeErrors", []):
+                reject(batch[error["index"]][0], error.get("errmsg", "Write failed"))
+
+    batch = []
+    try:
+        for line_number, row in rows:
+            report["rows_read"] += 1
+            try:
+                batch.append((line_number, coerce_job_row(row, unknown_skills)))
+            except (ValueError, ValidationError) as e:
+                reject(line_number, str(e))
+                continue
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+    finally:
+        # Publish whatever was written, even if the import stopped part-way
+        if report["imported"]:
+            report["catalog_version"] = await bump_catalog_version()
+
+    if report["imported"] and refresh:
+        await reload_job_catalog()
+    report["unknown_skills"] = sorted(unknown_skills)[:IMPORT_MAX_ERRORS]
+    elapsed = time.perf_counter() - start
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["rows_read"] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
+
+def import_format(filename, fmt=None):
+    """Feed format from an explicit value or the file extension"""
+    fmt = fmt or ("csv" if filename.lower().endswith(".csv") else "jsonl")
+    if fmt not in ("csv", "jsonl"):
+        raise HTTPException(status_code=400, detail="Format must be csv or jsonl")
+    return fmt
+
+# Admin authentication for catalog writes
+ADMIN_API_KEY = os.environ.get("ADMIN_API_KEY")
+
+async def require_admin(x_api_key: Optional[str] = Header(None)):
+    """Reject the request unless X-API-Key matches ADMIN_API_KEY"""
+    if not ADMIN_API_KEY or not hmac.compare_digest(x_api_key or "", ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Valid admin API key required")
+
+# Seconds clients may reuse GET /api/jobs/{id} without revalidating
+JOB_DETAIL_MAX_AGE = int(os.environ.get("JOB_DETAIL_MAX_AGE", "300"))
+
+# Upper bound on profiles per /match-jobs/batch request
+MAX_BATCH_PROFILES = int(os.environ.get("MAX_BATCH_PROFILES", "1000"))
+
+# Weight of TF-IDF similarity in the blended score for each match mode
+MATCH_MODE_WEIGHTS = {
+    "skills": 0.0,
+    "semantic": 1.0,
+    "hybrid": float(os.environ.get("HYBRID_SEMANTIC_WEIGHT", "0.5")),
+}
+
+async def get_profile_text_vector(profile_doc, catalog):
+    """TF-IDF vector of a profile's resume text, cached on the profile document.
+
+    The vector is stored with the id of the catalog model that produced it and
+    is recomputed only when the catalog vectorizer has been refit.
+    """
+    cached = profile_doc.get("text_vector")
+    if cached and cached.get("model") == catalog.text_model_id:
+        indices = np.array(cached["indices"], dtype=np.int32)
+        values = np.array(cached["values"], dtype=np.float32)
+        return sp.csr_matrix(
+            (values, indices, np.array([0, len(indices)])), shape=(1, len(catalog.vectorizer.vocabulary_))
+        )
+    raw_text = await get_profile_raw_text(profile_doc)
+    with STAGE_LATENCY.labels("text_vector").time():
+        vector = catalog.transform_text(raw_text)
+    await db.resume_profiles.update_one(
+        {"id": profile_doc["id"]},
+        {"$set": {"text_vector": {
+            "model": catalog.text_model_id,
+            "indices": vector.indices.tolist(),
+            "values": vector.data.tolist(),
+        }}}
+    )
+    return vector
+
+# Keyset pagination over (timestamp, id)
+PAGE_DEFAULT_LIMIT = 100
+PAGE_MAX_LIMIT = int(os.environ.get("PAGE_MAX_LIMIT", "1000"))
+EXPORT_BATCH_SIZE = 1000
+KEYSET_SORT = [("timestamp", 1), ("id", 1)]
+
+def encode_cursor(doc):
+    """Opaque cursor pointing just past doc"""
+    key = json.dumps([doc["timestamp"].isoformat(), doc["id"]])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def keyset_filter(cursor):
+    """Query for documents after cursor in (timestamp, id) order"""
+    if not cursor:
+        return {}
+    try:
+        timestamp, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        timestamp = datetime.fromisoformat(timestamp)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [
+        {"timestamp": {"$gt": timestamp}},
+        {"timestamp": timestamp, "id": {"$gt": doc_id}},
+    ]}
+
+async def fetch_page(collection, projection, cursor, limit):
+    """One page of documents and the cursor for the next page (None on the last page)"""
+    docs = await collection.find(keyset_filter(cursor), projection).sort(KEYSET_SORT).to_list(limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def stream_ndjson(collection, projection, cursor, limit=None):
+    """Stream matching documents as NDJSON straight from the Motor cursor"""
+    query = collection.find(keyset_filter(cursor), projection).sort(KEYSET_SORT).batch_size(EXPORT_BATCH_SIZE)
+    if limit:
+        query = query.limit(limit)
+
+    async def lines():
+        async for doc in query:
+            yield json.dumps(doc, default=json_default) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Candidate pool index for reverse matching
+PROFILE_INDEX_POLL_SECONDS = float(os.environ.get("PROFILE_INDEX_POLL_SECONDS", "10"))
+# Profiles saved by other workers may land this long after their timestamp; each poll re-reads that window
+PROFILE_INDEX_SYNC_LAG_SECONDS = float(os.environ.get("PROFILE_INDEX_SYNC_LAG_SECONDS", "30"))
+PROFILE_INDEX_PROJECTION = {"_id": 0, "id": 1, "skills": 1, "experience_years": 1, "timestamp": 1}
+profile_index_watcher = None
+
+if hasattr(np, "bitwise_count"):
+    popcount = np.bitwise_count
+else:
+    POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """Set bits of each uint64 word (NumPy < 2.0 has no bitwise_count)"""
+        octets = np.ascontiguousarray(words).view(np.uint8).reshape(*words.shape, 8)
+        return POPCOUNT_TABLE[octets].sum(axis=-1, dtype=np.uint8)
+
+class ProfileSkillIndex:
+    """Stored profiles' skills as bitsets, ranking candidates for a job as /match-jobs would score the job for them"""
+
+    def __init__(self, capacity=1024):
+        # Bit b of word b // 64 is set for row r when the profile lists the skill assigned bit b. Words are
+        # stored word-major, so a job reads one contiguous uint64 array per word its skills fall in.
+        # Profiles are immutable once stored: rows and words only grow, in doubling steps.
+        self.skill_bits = {}
+        self.profile_ids = []
+        self.row_index = {}
+        self._bits = np.zeros((1, capacity), dtype=np.uint64)
+        self._experience = np.zeros(capacity, dtype=np.float32)
+        self.synced_until = None  # newest profile timestamp seen
+        self.loaded = False  # set once the stored pool has been read in full
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def _skill_bit(self, skill):
+        bit = self.skill_bits.setdefault(skill, len(self.skill_bits))
+        if bit >= len(self._bits) * 64:
+            self._bits = np.pad(self._bits, ((0, len(self._bits)), (0, 0)))
+        return bit
+
+    def add(self, profile_id, skills, experience_years, timestamp=None):
+        """Index a profile; returns False if it is already indexed"""
+        if timestamp is not None and (self.synced_until is None or timestamp > self.synced_until):
+            self.synced_until = timestamp
+        if profile_id in self.row_index:
+            return False
+        row = len(self.profile_ids)
+        if row == len(self._experience):
+            self._bits = np.pad(self._bits, ((0, 0), (0, row)))
+            self._experience = np.pad(self._experience, (0, row))
+        for word, mask in self.skill_mask(skills, create=True).items():
+            self._bits[word, row] = mask
+        self._experience[row] = experience_years
+        self.profile_ids.append(profile_id)
+        self.row_index[profile_id] = row
+        return True
+
+    def skill_mask(self, skills, create=False):
+        """{word: bit mask} of a skill set; unknown skills are skipped unless create is set"""
+        words = {}
+        for skill in {skill.lower() for skill in skills}:
+            bit = self._skill_bit(skill) if create else self.skill_bits.get(skill)
+            if bit is not None:
+                words[bit >> 6] = words.get(bit >> 6, 0) | (1 << (bit & 63))
+        return words
+
+    def has_skill(self, row, skill):
+        bit = self.skill_bits.get(skill.lower())
+        return bit is not None and bool(self._bits[bit >> 6, row] & np.uint64(1 << (bit & 63)))
+
+    def rank(self, required_skills, experience_required, top_k=None,
+             min_experience_years=None, max_experience_years=None):
+        """(rows, final scores) of the top_k profiles sharing a skill with the job, best first"""
+        n = len(self.profile_ids)
+        mask = self.skill_mask(required_skills)
+        if not n or not mask:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        # For one job a score depends only on the overlap and the experience class (under, within 2 years,
+        # more than 2 years over), so scores come from a small table instead of per-profile arithmetic
+        skill_count = len({skill.lower() for skill in required_skills})
+        representative_experience = np.array([experience_required - 1, experience_required, experience_required + 3],
+                                             dtype=np.float32)
+        fit = JobCatalog._fit_scores(np.arange(skill_count + 1, dtype=np.float32)[:, None], np.float32(skill_count))
+        table = JobCatalog._final_scores(fit, representative_experience[None, :], experience_required).ravel()
+
+        key_type = np.uint8 if len(table) <= 256 else np.uint16
+        overlap = np.zeros(n, dtype=key_type)
+        for word, bits in mask.items():
+            overlap += popcount(self._bits[word, :n] & np.uint64(bits))
+        experience = self._experience[:n]
+        # Profiles outside the experience range count as sharing no skills
+        if min_experience_years is not None:
+            overlap *= experience >= min_experience_years
+        if max_experience_years is not None:
+            overlap *= experience <= max_experience_years
+        key = overlap * key_type(3)
+        key += experience >= experience_required
+        key += experience > experience_required + 2
+        if top_k is not None and top_k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        # Best-scoring table entries until they hold top_k profiles, plus entries tied with the last one;
+        # counting profiles per entry avoids sorting the whole pool
+        counts = np.bincount(key, minlength=len(table))
+        selected = np.zeros(len(table), dtype=bool)
+        last = None
+        total = 0
+        for entry in np.argsort(-table, kind="stable"):
+            if table[entry] <= 0 or (top_k is not None and total >= top_k and table[entry] < last):
+                break
+            if counts[entry]:
+                selected[entry] = True
+                last = table[entry]
+                total += counts[entry]
+        rows = np.flatnonzero(selected[key])
+        top = rows[top_k_rows(table[key[rows]], top_k)]
+        return top, table[key[top]]
+
+# Shared by every request; grows in place as profiles are saved or synced
+PROFILE_INDEX = ProfileSkillIndex()
+
+async def sync_profile_index():
+    """Index profiles stored since the last sync, including those saved by other workers"""
+    query = {}
+    if PROFILE_INDEX.synced_until is not None:
+        query = {"timestamp": {"$gte": PROFILE_INDEX.synced_until - timedelta(seconds=PROFILE_INDEX_SYNC_LAG_SECONDS)}}
+    added = 0
+    cursor = db.resume_profiles.find(query, PROFILE_INDEX_PROJECTION).sort(KEYSET_SORT).batch_size(EXPORT_BATCH_SIZE)
+    async for doc in cursor:
+        added += PROFILE_INDEX.add(doc["id"], doc["skills"], doc["experience_years"], doc.get("timestamp"))
+    PROFILE_INDEX.loaded = True
+    return added
+
+async def watch_profile_index():
+    """Load the stored candidate pool, then keep polling for profiles from other workers"""
+    while True:
+        try:
+            added = await sync_profile_index()
+            if added:
+                logger.info(f"Indexed {added} profiles ({len(PROFILE_INDEX)} in the candidate pool)")
+        except Exception as e:
+            logger.error(f"Error syncing profile index: {str(e)}")
+        await asyncio.sleep(PROFILE_INDEX_POLL_SECONDS)
+
+def cache_stats():
+    """Stats of every cache in this worker, keyed by cache name (None if disabled)"""
+    return {
+        "match_cache": MATCH_CACHE.stats(),
+        "match_cache_shared": MATCH_CACHE_SHARED.stats() if MATCH_CACHE_SHARED is not None else None,
+        "parse_cache": PARSE_CACHE.stats(),
+        "skill_gap_cache": SKILL_GAP_CACHE.stats(),
+    }
+
+class ServiceStateCollector:
+    """Gauges read from live service state at scrape time"""
+
+    def collect(self):
+        catalog = JOB_CATALOG
+        yield GaugeMetricFamily("job_catalog_postings", "Job postings in the loaded catalog snapshot", value=len(catalog))
+        yield GaugeMetricFamily("job_catalog_version", "Version of the loaded catalog snapshot", value=catalog.version)
+        yield GaugeMetricFamily("profile_index_profiles", "Profiles in the candidate pool index", value=len(PROFILE_INDEX))
+        yield GaugeMetricFamily("resume_parse_in_flight", "Resume parses queued or running in the parse pool", value=PARSE_POOL.pending)
+        yield GaugeMetricFamily("resume_parse_capacity", "Parses the pool accepts before rejecting uploads", value=PARSE_POOL.max_pending)
+        hit_ratio = GaugeMetricFamily("cache_hit_ratio", "Cache hits over lookups since start", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "Entries held by in-process caches", labels=["cache"])
+        for name, stats in cache_stats().items():
+            if stats is None:
+                continue
+            hit_ratio.add_metric([name], stats["hit_ratio"])
+            if "size" in stats:
+                size.add_metric([name], stats["size"])
+        yield hit_ratio
+        yield size
+
+REGISTRY.register(ServiceStateCollector())
+
+# Startup warm-up and readiness
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+warmup_task = None
+
+def warm_catalog(catalog):
+    """Run one ranking per match mode and a skill-gap query against the catalog"""
+    job = next(iter(catalog), None)
+    if job is None:
+        return
+    text_vector = catalog.transform_text(catalog.job_text(job))
+    for semantic_weight in MATCH_MODE_WEIGHTS.values():
+        catalog.match_json(job["required_skills"], job["experience_required"], 10,
+                           text_vector=text_vector, semantic_weight=semantic_weight)
+    catalog.skill_gaps(job["required_skills"][:1], job["experience_required"], SKILL_GAP_TOP_N)
+
+async def warm_up():
+    """Pay one-off setup costs (parser imports and processes, first rankings) before reporting ready"""
+    started = time.perf_counter()
+    try:
+        await PARSE_POOL.warm_up()
+        await asyncio.to_thread(warm_catalog, JOB_CATALOG)
+        logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        # Warm-up only saves latency; a failure must not keep the worker out of rotation
+        logger.error(f"Error during warm-up: {str(e)}")
+
+def readiness_checks():
+    """Readiness of each startup step, keyed by step"""
+    return {
+        "job_catalog": JOB_CATALOG.version > 0,
+        "candidate_index": PROFILE_INDEX.loaded,
+        "warm_up": warmup_task is None or warmup_task.done(),
+    }
+
 # Routes
 @api_router.get("/")
 async def root():
     return {"message": "AI Powered Job Resume & Job Matcher System API"}
 
 @api_router.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
-    """Upload and parse resume file"""
+async def upload_resume(
+    file: UploadFile = File(...),
+    on_duplicate: Optional[Literal["reuse", "link"]] = None,
+    background: bool = False,
+    priority: int = 0,
+):
+    """Upload and parse resume file.
+
+    Files are identified by the SHA-256 of their bytes. Re-uploading a known
+    file skips parsing: with on_duplicate=reuse the existing profile is
+    returned, with on_duplicate=link a new profile is created that shares the
+    original parse instead of storing another copy of the text.
+
+    The resume text (and, with STORE_ORIGINAL_FILES, the uploaded file) is
+    stored compressed in resume_blobs and left out of the response; fetch it
+    with GET /api/profiles/{id}/raw-text.
+
+    With background=true the file is queued instead and the response is
+    202 with a task id; poll GET /api/tasks/{id} for progress and the
+    profile. Higher priority tasks are processed first.
+    """
     try:
         # Validate file type
-        if not file.filename.lower().endswith(('.pdf', '.docx', '.txt')):
+        if not file.filename.lower().endswith(SUPPORTED_RESUME_EXTENSIONS):
             raise HTTPException(status_code=400, detail="Only PDF, DOCX, and TXT files are supported")
         
-        file_content = await file.read()
+        on_duplicate = on_duplicate or RESUME_DEDUP_MODE
+        with STAGE_LATENCY.labels("upload_read").time():
+            source, content_hash = await spool_upload(file)
+        
+        try:
+            if background:
+                return await enqueue_resume_task(file.filename, source, content_hash, on_duplicate, priority)
+            return await ingest_upload(file.filename, source, content_hash, on_duplicate)
+        finally:
+            release_upload(source)
         
-        # Extract text based on file type
-        if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(file_content)
-        elif file.filename.lower().endswith('.docx'):
-            text = extract_text_from_docx(file_content)
-        else:  # txt
-            text = file_content.decode('utf-8')
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+@api_router.post("/upload-resume/bulk")
+async def upload_resumes_bulk(
+    files: List[UploadFile] = File(...),
+    on_duplicate: Optional[Literal["reuse", "link"]] = None,
+):
+    """Upload many resumes at once, as individual files and/or ZIP archives.
+
+    Files are parsed concurrently and the response streams one NDJSON line
+    per file as it finishes, with its profile_id or an error, followed by a
+    summary line. A file that cannot be parsed does not fail the others.
+    """
+    on_duplicate = on_duplicate or RESUME_DEDUP_MODE
+    uploads = []
+    try:
+        # Spool everything up front: the multipart files are closed once this handler returns
+        for file in files:
+            filename = file.filename or ""
+            is_archive = filename.lower().endswith(".zip")
+            if not is_archive and not filename.lower().endswith(SUPPORTED_RESUME_EXTENSIONS):
+                uploads.append((filename, None, None, "Only PDF, DOCX, ZIP, and TXT files are supported"))
+                continue
+            try:
+                source, content_hash = await spool_upload(file, MAX_BULK_ARCHIVE_BYTES if is_archive else None)
+            except HTTPException as e:
+                uploads.append((filename, None, None, e.detail))
+                continue
+            uploads.append((filename, source, content_hash, None))
+    except BaseException:
+        for _, source, _, _ in uploads:
+            release_upload(source)
+        raise
+
+    async def results():
+        started = time.perf_counter()
+        summary = {"files": 0, "succeeded": 0, "failed": 0, "duplicates": 0}
+        try:
+            async for result in ingest_resumes(iter_bulk_entries(uploads), on_duplicate):
+                summary["files"] += 1
+                summary["succeeded" if result["success"] else "failed"] += 1
+                summary["duplicates"] += bool(result.get("duplicate"))
+                yield json.dumps(result) + "\n"
+            summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+            yield json.dumps({"summary": summary}) + "\n"
+        finally:
+            # Covers archives and files never reached if the client disconnects
+            for _, source, _, _ in uploads:
+                release_upload(source)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@api_router.post("/match-jobs/batch")
+async def match_jobs_batch(request: BatchMatchRequest):
+    """Find the top matching jobs for many candidate profiles in one call"""
+    try:
+        if len(request.profile_ids) > MAX_BATCH_PROFILES:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PROFILES} profiles per batch")
         
-        # Parse resume
-        name, email = extract_basic_info(text)
-        skills = extract_skills_from_text(text)
-        experience_years = extract_experience_years(text)
+        # One round trip for every profile, fetching only what scoring needs
+        profile_ids = list(dict.fromkeys(request.profile_ids))
+        cursor = db.resume_profiles.find({"id": {"$in": profile_ids}}, PROFILE_SUMMARY_PROJECTION)
+        profiles = {doc["id"]: doc for doc in await cursor.to_list(len(profile_ids))}
+        found = [profiles[profile_id] for profile_id in profile_ids if profile_id in profiles]
         
-        # Create profile
-        profile = ResumeProfile(
-            name=name,
-            email=email,
-            skills=skills,
-            experience_years=experience_years,
-            education="Extracted from resume",  # Could be enhanced
-            certifications=[],  # Could be enhanced
-            raw_text=text
+        fields = parse_match_fields(request.fields)
+        catalog = JOB_CATALOG
+        results = []
+        scores_iter = catalog.score_many(
+            [doc["skills"] for doc in found], [doc["experience_years"] for doc in found]
         )
+        active_rows = np.flatnonzero([job is not None for job in catalog.jobs])
+        with STAGE_LATENCY.labels("batch_scoring").time():
+            for doc, scores in zip(found, scores_iter):
+                rows = active_rows if request.include_unmatched else np.flatnonzero(scores > 0)
+                ranked = rows[top_k_rows(scores[rows], request.top_k)]
+                matches = catalog.match_dicts(doc["skills"], [(row, scores[row], None) for row in ranked], fields)
+                results.append({
+                    "profile_id": doc["id"],
+                    "matches": matches,
+                    "total_matches": len(matches)
+                })
         
-        # Save to database
-        await db.resume_profiles.insert_one(profile.dict())
-        
-        return {
+        return ORJSONResponse({
             "success": True,
-            "profile": profile,
-            "message": f"Resume parsed successfully! Found {len(skills)} skills."
-        }
+            "results": results,
+            "missing_profile_ids": [profile_id for profile_id in profile_ids if profile_id not in profiles],
+            "total_profiles": len(results)
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+        logger.error(f"Error batch matching jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error batch matching jobs: {str(e)}")
 
 @api_router.post("/match-jobs/{profile_id}")
-async def match_jobs(profile_id: str):
-    """Find matching jobs for a candidate profile"""
+async def match_jobs(
+    profile_id: str,
+    top_k: Optional[int] = None,
+    include_unmatched: bool = False,
+    mode: Literal["skills", "semantic", "hybrid"] = "skills",
+    fields: Optional[str] = None,
+):
+    """Find matching jobs for a candidate profile.
+
+    Matches carry the job id, scores and matched/missing skills by default;
+    pass fields= (comma-separated JobMatch fields, or "all") for more, or
+    fetch static job details from GET /api/jobs/{id}. Without top_k every
+    matching job is returned, except on catalogs large enough for an
+    ann_index, where the best ANN_DEFAULT_TOP_K are.
+    """
     try:
-        # Get profile from database
-        profile_doc = await db.resume_profiles.find_one({"id": profile_id})
+        selected_fields = parse_match_fields(fields)
+        catalog = JOB_CATALOG
+        if top_k is None and catalog.ann_index is not None:
+            top_k = ANN_DEFAULT_TOP_K
+
+        # Get profile summary from database; semantic modes also need the cached text vector
+        projection = PROFILE_SUMMARY_PROJECTION if mode == "skills" else PROFILE_SEMANTIC_PROJECTION
+        profile_doc = await db.resume_profiles.find_one({"id": profile_id}, projection)
         if not profile_doc:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        profile = ResumeProfile(**profile_doc)
-        job_matches = []
+        profile = ProfileSummary(**profile_doc)
         
-        for job_data in SAMPLE_JOBS:
-            # Calculate match score
-            fit_score = calculate_job_match_score(profile.skills, job_data["required_skills"])
-            
-            # Find matched and missing skills
-            candidate_skills_lower = [skill.lower() for skill in profile.skills]
-            job_skills_lower = [skill.lower() for skill in job_data["required_skills"]]
-            
-            matched_skills = [skill for skill in job_data["required_skills"] 
-                            if skill.lower() in candidate_skills_lower]
-            missing_skills = [skill for skill in job_data["required_skills"] 
-                            if skill.lower() not in candidate_skills_lower]
-            
-            # Experience factor
-            exp_factor = 1.0
-            if profile.experience_years < job_data["experience_required"]:
-                exp_factor = 0.8  # Reduce score if under-experienced
-            elif profile.experience_years > job_data["experience_required"] + 2:
-                exp_factor = 1.1  # Boost score if over-qualified
-            
-            final_score = min(fit_score * exp_factor, 100.0)
-            
-            # Generate job search URLs
-            job_search_urls = generate_job_search_urls(job_data["title"], job_data["company"], job_data["location"])
-            
-            job_match = JobMatch(
-                id=job_data["id"],
-                title=job_data["title"],
-                company=job_data["company"],
-                required_skills=job_data["required_skills"],
-                experience_required=job_data["experience_required"],
-                description=job_data["description"],
-                location=job_data["location"],
-                salary_range=job_data["salary_range"],
-                fit_score=round(final_score, 1),
-                matched_skills=matched_skills,
-                missing_skills=missing_skills,
-                job_search_urls=job_search_urls
-            )
-            
-            job_matches.append(job_match)
+        cache_key = match_cache_key(
+            profile_id, profile.skills, profile.experience_years, catalog, mode, top_k, include_unmatched,
+            ",".join(selected_fields)
+        )
+        # Cached entries are [total_matches, serialized matches array]
+        cached = MATCH_CACHE.get(cache_key)
+        if cached is None and MATCH_CACHE_SHARED is not None:
+            cached = await asyncio.to_thread(MATCH_CACHE_SHARED.get, cache_key)
+            if cached is not None:
+                MATCH_CACHE.put(cache_key, cached)
         
-        # Sort by fit score
-        job_matches.sort(key=lambda x: x.fit_score, reverse=True)
+        if cached is None:
+            semantic_weight = MATCH_MODE_WEIGHTS[mode]
+            text_vector = await get_profile_text_vector(profile_doc, catalog) if semantic_weight > 0 else None
+            
+            # Score only jobs sharing a skill (or, in semantic modes, a term) with the candidate
+            cached = list(catalog.match_json(
+                profile.skills, profile.experience_years, top_k, include_unmatched,
+                text_vector=text_vector, semantic_weight=semantic_weight, fields=selected_fields
+            ))
+            MATCH_CACHE.put(cache_key, cached)
+            if MATCH_CACHE_SHARED is not None:
+                await asyncio.to_thread(MATCH_CACHE_SHARED.put, cache_key, cached)
         
-        return {
-            "success": True,
-            "profile_id": profile_id,
-            "matches": job_matches,
-            "total_matches": len(job_matches)
-        }
+        total_matches, matches_json = cached
+        return Response(
+            content=f'{{"success":true,"profile_id":{orjson.dumps(profile_id).decode()},'
+                    f'"matches":{matches_json},"total_matches":{total_matches}}}',
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error matching jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error matching jobs: {str(e)}")
 
+@api_router.post("/jobs/{job_id}/candidates")
+async def match_candidates(job_id: str, request: CandidateSearchRequest = CandidateSearchRequest()):
+    """Rank stored candidate profiles for a job, optionally within an experience range"""
+    try:
+        job = JOB_CATALOG.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if not PROFILE_INDEX.loaded:
+            raise HTTPException(status_code=503, detail="Candidate index is still loading")
+
+        index = PROFILE_INDEX
+        with STAGE_LATENCY.labels("candidate_scoring").time():
+            rows, scores = index.rank(
+                job["required_skills"], job["experience_required"], request.top_k,
+                request.min_experience_years, request.max_experience_years
+            )
+        profile_ids = [index.profile_ids[row] for row in rows]
+        cursor = db.resume_profiles.find(
+            {"id": {"$in": profile_ids}}, {"_id": 0, "id": 1, "name": 1, "email": 1, "experience_years": 1}
+        )
+        profiles = {doc["id"]: doc for doc in await cursor.to_list(len(profile_ids))}
+
+        candidates = []
+        for row, profile_id, score in zip(rows, profile_ids, scores):
+            has = [index.has_skill(row, skill) for skill in job["required_skills"]]
+            candidates.append({
+                **profiles.get(profile_id, {"id": profile_id}),
+                "fit_score": float(score),
+                "matched_skills": [skill for skill, held in zip(job["required_skills"], has) if held],
+                "missing_skills": [skill for skill, held in zip(job["required_skills"], has) if not held],
+            })
+
+        return ORJSONResponse({
+            "success": True,
+            "job_id": job_id,
+            "candidates": candidates,
+            "total_candidates": len(candidates)
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error matching candidates: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error matching candidates: {str(e)}")
+
 @api_router.post("/learning-recommendations/{profile_id}")
 async def get_learning_recommendations(profile_id: str):
     """Get personalized learning recommendations"""
     try:
-        # Get profile from database
-        profile_doc = await db.resume_profiles.find_one({"id": profile_id})
+        # Get profile summary from database
+        profile_doc = await db.resume_profiles.find_one({"id": profile_id}, PROFILE_SUMMARY_PROJECTION)
         if not profile_doc:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        profile = ResumeProfile(**profile_doc)
+        profile = ProfileSummary(**profile_doc)
         
-        # Get all required skills from top job matches
-        all_required_skills = set()
-        candidate_skills_lower = [skill.lower() for skill in profile.skills]
-        
-        for job_data in SAMPLE_JOBS[:3]:  # Top 3 jobs
-            for skill in job_data["required_skills"]:
-                if skill.lower() not in candidate_skills_lower:
-                    all_required_skills.add(skill)
+        # Missing skills ranked by the fit they add across the top matches
+        catalog = JOB_CATALOG
+        cache_key = (
+            catalog.version, frozenset(skill.lower() for skill in profile.skills), profile.experience_years
+        )
+        skill_gaps = SKILL_GAP_CACHE.get(cache_key)
+        if skill_gaps is None:
+            with STAGE_LATENCY.labels("skill_gaps").time():
+                skill_gaps = catalog.skill_gaps(profile.skills, profile.experience_years, SKILL_GAP_TOP_N)
+            SKILL_GAP_CACHE.put(cache_key, skill_gaps)
         
         # Generate recommendations
-        missing_skills = list(all_required_skills)
-        recommendations = generate_learning_recommendations(missing_skills)
+        recommendations = generate_learning_recommendations(
+            [gap["skill"] for gap in skill_gaps], {gap["skill"]: gap for gap in skill_gaps}
+        )
         
         return {
             "success": True,
@@ -455,19 +3053,155 @@ async def get_learning_recommendations(profile_id: str):
             "total_recommendations": len(recommendations)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
 
+@api_router.post("/jobs", dependencies=[Depends(require_admin)])
+async def upsert_job(job: JobPosting):
+    """Create or replace a job posting"""
+    try:
+        await db.jobs.replace_one({"id": job.id}, job.dict(), upsert=True)
+        await bump_catalog_version([job.id])
+        catalog = await reload_job_catalog()
+        return {"success": True, "job": job, "catalog_version": catalog.version}
+    except Exception as e:
+        logger.error(f"Error saving job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error saving job: {str(e)}")
+
+@api_router.post("/jobs/import", dependencies=[Depends(require_admin)])
+async def import_jobs_feed(file: UploadFile = File(...), format: Optional[Literal["csv", "jsonl"]] = None):
+    """Bulk import a JSONL or CSV job feed"""
+    try:
+        fmt = import_format(file.filename, format)
+        text_stream = io.TextIOWrapper(file.file, encoding="utf-8", errors="surrogateescape", newline="")
+        try:
+            report = await import_jobs(iter_job_rows(text_stream, fmt))
+        finally:
+            text_stream.detach()
+        logger.info(f"Imported job feed {file.filename}: {report['imported']} rows, {report['rejected']} rejected")
+        return {"success": True, **report}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error importing jobs: {str(e)}")
+
+@api_router.get("/jobs/{job_id}")
+async def get_job(job_id: str, if_none_match: Optional[str] = Header(None)):
+    """Static details of a job posting, cacheable by browsers and proxies"""
+    detail = JOB_CATALOG.job_detail(job_id)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    content, etag = detail
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={JOB_DETAIL_MAX_AGE}"}
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+@api_router.delete("/jobs/{job_id}", dependencies=[Depends(require_admin)])
+async def delete_job(job_id: str):
+    """Remove a job posting"""
+    try:
+        result = await db.jobs.delete_one({"id": job_id})
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Job not found")
+        await bump_catalog_version([job_id])
+        catalog = await reload_job_catalog()
+        return {"success": True, "job_id": job_id, "catalog_version": catalog.version}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error deleting job: {str(e)}")
+
+@api_router.get("/ready")
+async def readiness():
+    """Readiness probe: 503 until the catalog is loaded, the candidate index is built and warm-up is done"""
+    checks = readiness_checks()
+    ready = all(checks.values())
+    return JSONResponse({"ready": ready, "checks": checks}, status_code=200 if ready else 503)
+
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for this worker's caches"""
+    return {
+        "success": True,
+        "catalog_version": JOB_CATALOG.version,
+        **cache_stats(),
+    }
+
+@api_router.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Progress of a background resume upload, with its result once finished"""
+    task = await db.resume_tasks.find_one({"id": task_id}, TASK_VIEW_PROJECTION)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task["status"] == "queued":
+        task["queue_position"] = await db.resume_tasks.count_documents({
+            "status": "queued",
+            "$or": [
+                {"priority": {"$gt": task["priority"]}},
+                {"priority": task["priority"], "created_at": {"$lt": task["created_at"]}},
+            ],
+        })
+    return {"success": True, "task": task}
+
+@api_router.get("/profiles/{profile_id}/raw-text")
+async def get_profile_text(profile_id: str):
+    """Fetch a profile's resume text on demand"""
+    profile_doc = await db.resume_profiles.find_one(
+        {"id": profile_id}, {"_id": 0, "id": 1, "raw_text": 1, "raw_text_id": 1, "content_hash": 1}
+    )
+    if not profile_doc:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"success": True, "profile_id": profile_id, "raw_text": await get_profile_raw_text(profile_doc)}
+
+@api_router.get("/profiles/{profile_id}/file")
+async def get_profile_file(profile_id: str):
+    """Download the original uploaded resume, when it was kept"""
+    profile_doc = await db.resume_profiles.find_one({"id": profile_id}, {"_id": 0, "file_id": 1})
+    if not profile_doc:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    data, blob = await load_blob(profile_doc["file_id"]) if profile_doc.get("file_id") else (None, None)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Original file was not stored for this profile")
+    filename = blob.get("filename", "resume")
+    media_types = {".pdf": "application/pdf", ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".txt": "text/plain"}
+    return Response(
+        content=data,
+        media_type=media_types.get(os.path.splitext(filename.lower())[1], "application/octet-stream"),
+        headers={"Content-Disposition": f'attachment; filename="{urllib.parse.quote(filename)}"'}
+    )
+
 @api_router.get("/profiles")
-async def get_profiles():
-    """Get all resume profiles"""
+async def get_profiles(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json"
+):
+    """List resume profiles (without their resume text), oldest first.
+
+    Pass next_cursor back as cursor to fetch the following page. With
+    format=ndjson every profile after cursor is streamed one per line,
+    up to limit when one is given.
+    """
     try:
-        profiles = await db.resume_profiles.find().to_list(100)
+        if format == "ndjson":
+            return stream_ndjson(db.resume_profiles, PROFILE_LIST_PROJECTION, cursor, limit)
+        limit = PAGE_DEFAULT_LIMIT if limit is None else limit
+        if not 1 <= limit <= PAGE_MAX_LIMIT:
+            raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+        profiles, next_cursor = await fetch_page(db.resume_profiles, PROFILE_LIST_PROJECTION, cursor, limit)
         return {
             "success": True,
-            "profiles": [ResumeProfile(**profile) for profile in profiles]
+            "profiles": profiles,
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching profiles: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching profiles: {str(e)}")
@@ -481,13 +3215,46 @@ async def create_status_check(input: StatusCheckCreate):
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def get_status_checks(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json"
+):
+    """Status checks oldest first; the next page's cursor is in the X-Next-Cursor header"""
+    if format == "ndjson":
+        return stream_ndjson(db.status_checks, {"_id": 0}, cursor, limit)
+    limit = PAGE_DEFAULT_LIMIT if limit is None else limit
+    if not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+    status_checks, next_cursor = await fetch_page(db.status_checks, {"_id": 0}, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return status_checks
 
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.middleware("http")
+async def record_request_latency(request, call_next):
+    """Observe REQUEST_LATENCY labelled with the matched route template"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            request.method, route.path if route is not None else "unmatched", str(status)
+        ).observe(time.perf_counter() - started)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for this worker process"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -503,6 +3270,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_db_client():
+    global catalog_watcher, profile_index_watcher, warmup_task
+    await db.resume_parses.create_index("content_hash", unique=True)
+    await db.resume_profiles.create_index("id", unique=True)
+    await db.resume_profiles.create_index("email")
+    await db.resume_profiles.create_index(KEYSET_SORT)
+    await db.status_checks.create_index(KEYSET_SORT)
+    await db.jobs.create_index("id", unique=True)
+    await db.catalog_changes.create_index("version")
+    await db.resume_tasks.create_index("id", unique=True)
+    await db.resume_tasks.create_index([("status", 1), ("priority", -1), ("created_at", 1)])
+    await seed_job_catalog()
+    await reload_job_catalog(force=True)
+    catalog_watcher = asyncio.create_task(watch_job_catalog())
+    profile_index_watcher = asyncio.create_task(watch_profile_index())
+    start_task_workers()
+    if WARMUP_ON_STARTUP:
+        # Runs after startup so liveness checks pass while /api/ready still reports 503
+        warmup_task = asyncio.create_task(warm_up())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if catalog_watcher is not None:
+        catalog_watcher.cancel()
+    if profile_index_watcher is not None:
+        profile_index_watcher.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    for worker in task_workers:
+        # Interrupted tasks are picked up again once their lease expires
+        worker.cancel()
+    PARSE_POOL.shutdown()
+    if MATCH_CACHE_SHARED is not None:
+        MATCH_CACHE_SHARED.close()
     client.close()
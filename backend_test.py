@@ -69,7 +69,7 @@ class SmartJobRecommendationAPITest(unittest.TestCase):
             
         print(f"\n🔍 Testing job matching for profile {self.profile_id}...")
         
-        response = requests.post(f"{self.base_url}/match-jobs/{self.profile_id}")
+        response = requests.post(f"{self.base_url}/match-jobs/{self.profile_id}", params={"fields": "all"})
         self.assertEqual(response.status_code, 200)
         
         data = response.json()
@@ -102,6 +102,17 @@ class SmartJobRecommendationAPITest(unittest.TestCase):
         print(f"   Missing skills: {job['missing_skills']}")
         print(f"   Job search platforms: {list(job['job_search_urls'].keys())}")
         
+        # The default response is lean; static details come from GET /jobs/{id}
+        lean = requests.post(f"{self.base_url}/match-jobs/{self.profile_id}").json()["matches"][0]
+        self.assertEqual(set(lean), {"id", "fit_score", "semantic_score", "matched_skills", "missing_skills"})
+        self.assertEqual(lean["fit_score"], job["fit_score"])
+        
+        detail = requests.get(f"{self.base_url}/jobs/{lean['id']}")
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.json()["title"], job["title"])
+        cached = requests.get(f"{self.base_url}/jobs/{lean['id']}", headers={"If-None-Match": detail.headers["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+        
     def test_04_learning_recommendations(self):
         """Test learning recommendations functionality"""
         if not self.profile_id:
@@ -155,6 +166,50 @@ class SmartJobRecommendationAPITest(unittest.TestCase):
         
         print(f"✅ Get profiles test passed. Found {len(data['profiles'])} profiles")
         
+    def test_06_batch_match_jobs(self):
+        """Test batch job matching for several profiles"""
+        if not self.profile_id:
+            self.profile_id = self.test_02_upload_resume()
+            
+        print("\n🔍 Testing batch job matching...")
+        
+        payload = {"profile_ids": [self.profile_id, "missing-profile"], "top_k": 3}
+        response = requests.post(f"{self.base_url}/match-jobs/batch", json=payload)
+        self.assertEqual(response.status_code, 200)
+        
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["missing_profile_ids"], ["missing-profile"])
+        self.assertEqual(len(data["results"]), 1)
+        
+        result = data["results"][0]
+        self.assertEqual(result["profile_id"], self.profile_id)
+        self.assertLessEqual(len(result["matches"]), 3)
+        
+        print(f"✅ Batch matching test passed. Top matches: {[job['id'] for job in result['matches']]}")
+        
+    def test_07_match_candidates(self):
+        """Test ranking stored candidates for a job"""
+        if not self.profile_id:
+            self.profile_id = self.test_02_upload_resume()
+            
+        print("\n🔍 Testing candidate matching for a job...")
+        
+        response = requests.post(f"{self.base_url}/jobs/job_1/candidates", json={"top_k": 5})
+        self.assertEqual(response.status_code, 200)
+        
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertLessEqual(len(data["candidates"]), 5)
+        for candidate in data["candidates"]:
+            self.assertGreater(candidate["fit_score"], 0)
+            self.assertTrue(candidate["matched_skills"])
+        
+        response = requests.post(f"{self.base_url}/jobs/missing-job/candidates")
+        self.assertEqual(response.status_code, 404)
+        
+        print(f"✅ Candidate matching test passed. Top candidates: {[c['id'] for c in data['candidates']]}")
+        
     def run_all_tests(self):
         """Run all tests in sequence"""
         try:
@@ -163,6 +218,8 @@ class SmartJobRecommendationAPITest(unittest.TestCase):
             self.test_03_match_jobs()
             self.test_04_learning_recommendations()
             self.test_05_get_profiles()
+            self.test_06_batch_match_jobs()
+            self.test_07_match_candidates()
             print("\n✅ All backend API tests passed successfully!")
         except AssertionError as e:
             print(f"\n❌ Test failed: {str(e)}")
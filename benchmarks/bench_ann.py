@@ -0,0 +1,87 @@
+"""Benchmark the approximate job index: recall@k against exact ranking, and latency.
+
+Builds a synthetic catalog, attaches a JobEmbeddingIndex regardless of
+ANN_MIN_JOBS, then ranks the same candidates exactly and through the index
+for a grid of nprobe / shortlist sizes. Recall counts approximate results
+scoring at least the exact k-th score, so ties at the cut-off are not
+penalized.
+
+Usage:
+    python benchmarks/bench_ann.py [--jobs 200000] [--queries 50]
+    python benchmarks/bench_ann.py --jobs 1000000 --nprobe 32,64,128 --candidates 1000,2000,5000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import server  # noqa: E402
+from run_benchmarks import parse_sizes, synthetic_jobs  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=parse_sizes, default=[16, 32, 64, 128])
+    parser.add_argument("--candidates", type=parse_sizes, default=[1000, 2000, 5000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    catalog, build = timed(lambda: server.JobCatalog(synthetic_jobs(args.jobs, rng)))
+    print(f"JobCatalog build ({args.jobs} jobs): {build:.1f} s")
+    index, build = timed(lambda: server.JobEmbeddingIndex(catalog))
+    print(f"JobEmbeddingIndex build: {build:.1f} s, {len(index.centroids)} lists, "
+          f"{index.components.shape[0]} dimensions, {index.embeddings.nbytes / 2**20:.0f} MiB of embeddings")
+
+    queries = []
+    for _ in range(args.queries):
+        skills = rng.sample(server.TECH_SKILLS, rng.randint(3, 12))
+        text_vector = catalog.transform_text(" ".join(skills) + " backend engineer distributed systems")
+        queries.append((skills, rng.randint(0, 12), text_vector))
+
+    for mode, weight in server.MATCH_MODE_WEIGHTS.items():
+        def rank(skills, experience_years, text_vector, exact):
+            return catalog.rank(skills, experience_years, args.top_k, text_vector=text_vector if weight > 0 else None,
+                                semantic_weight=weight, exact=exact)
+
+        catalog.ann_index = None
+        exact, exact_times = [], []
+        for skills, experience_years, text_vector in queries:
+            ranked, elapsed = timed(lambda: rank(skills, experience_years, text_vector, True))
+            exact.append(sorted((float(score) for _, score, _ in ranked), reverse=True))
+            exact_times.append(elapsed)
+        print(f"\n{mode}: exact median {statistics.median(exact_times) * 1e3:.2f} ms")
+
+        catalog.ann_index = index
+        for nprobe in args.nprobe:
+            for candidates in args.candidates:
+                index.nprobe, index.candidates_per_query = nprobe, candidates
+                hits = total = 0
+                times = []
+                for (skills, experience_years, text_vector), expected in zip(queries, exact):
+                    ranked, elapsed = timed(lambda: rank(skills, experience_years, text_vector, False))
+                    times.append(elapsed)
+                    if expected:
+                        hits += sum(float(score) >= expected[-1] for _, score, _ in ranked)
+                        total += len(expected)
+                recall = hits / total if total else 1.0
+                print(f"  nprobe {nprobe:>4}  candidates {candidates:>5}  recall@{args.top_k} {recall:.3f}  "
+                      f"median {statistics.median(times) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark reverse matching: ProfileSkillIndex.rank against scoring profiles one by one.
+
+Usage:
+    python benchmarks/bench_candidates.py [--profiles 1000000] [--jobs 20]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import server  # noqa: E402
+from run_benchmarks import synthetic_jobs  # noqa: E402
+
+LOOP_SAMPLE = 20000  # profiles scored by the per-profile loop; its time is scaled up to the pool
+
+
+def loop_rank(profiles, job, top_k):
+    """The pre-index approach: score every profile with calculate_job_match_score"""
+    scores = []
+    for profile_id, skills, experience_years in profiles:
+        fit = server.calculate_job_match_score(skills, job["required_skills"])
+        factor = server.experience_factors(experience_years, job["experience_required"])
+        scores.append((round(min(fit * factor, 100.0), 1), profile_id))
+    return sorted(scores, reverse=True)[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=1000000)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = [
+        (f"profile_{n}", rng.sample(server.TECH_SKILLS, rng.randint(3, 15)), rng.randint(0, 15))
+        for n in range(args.profiles)
+    ]
+    index = server.ProfileSkillIndex()
+    start = time.perf_counter()
+    for profile_id, skills, experience_years in profiles:
+        index.add(profile_id, skills, experience_years)
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {len(index)} profiles in {elapsed:.1f} s ({elapsed / len(index) * 1e6:.1f} us each), "
+          f"{index._bits.shape[0]} words per profile")
+
+    jobs = list(synthetic_jobs(args.jobs, rng))
+    for label, experience_range in (("all profiles", (None, None)), ("5-10 years", (5, 10))):
+        timings = []
+        for job in jobs:
+            start = time.perf_counter()
+            index.rank(job["required_skills"], job["experience_required"], args.top_k, *experience_range)
+            timings.append(time.perf_counter() - start)
+        print(f"  rank, {label:<14} median {statistics.median(timings) * 1e3:8.2f} ms  "
+              f"max {max(timings) * 1e3:8.2f} ms")
+
+    sample = profiles[:LOOP_SAMPLE]
+    start = time.perf_counter()
+    for job in jobs:
+        loop_rank(sample, job, args.top_k)
+    per_job = (time.perf_counter() - start) / len(jobs) * len(profiles) / len(sample)
+    print(f"  per-profile loop  ~{per_job * 1e3:8.0f} ms per job (extrapolated from {len(sample)} profiles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Import-time profile of server.py from `python -X importtime`.
+
+Imports the server module in fresh interpreters, reports the median
+cumulative time of the module and of each package it imports directly, and
+checks that the lazily imported libraries stay unloaded. The tracked
+baseline lives in benchmarks/import_profile.json.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5]
+    python benchmarks/bench_import_time.py --write          # refresh the tracked baseline
+    python benchmarks/bench_import_time.py --compare benchmarks/import_profile.json
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+BASELINE = Path(__file__).resolve().parent / "import_profile.json"
+# Imported on first use only; loading any of them at import time is a regression
+DEFERRED_MODULES = ["sklearn", "PyPDF2", "docx", "scipy.sparse.linalg"]
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+PROBE = "import sys, server; print(','.join(m for m in {modules!r} if m in sys.modules))"
+
+
+def profile_once():
+    """({module: cumulative seconds} for server and its direct imports, deferred modules that loaded)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(modules=DEFERRED_MODULES)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    lines = [LINE.match(line) for line in result.stderr.splitlines()]
+    lines = [match for match in lines if match]
+    # importtime prints children before their parent; server's direct imports are indented one level
+    server_index = next(i for i, match in enumerate(lines) if match.group(4) == "server")
+    server_depth = len(lines[server_index].group(3))
+    start = server_index
+    while start > 0 and len(lines[start - 1].group(3)) > server_depth:
+        start -= 1
+    timings = {"server": int(lines[server_index].group(2)) / 1e6}
+    for match in lines[start:server_index]:
+        if len(match.group(3)) == server_depth + 2:
+            timings[match.group(4)] = int(match.group(2)) / 1e6
+    loaded = [module for module in result.stdout.strip().split(",") if module]
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--write", action="store_true", help=f"Write the profile to {BASELINE.name}")
+    parser.add_argument("--compare", help="Earlier profile to compare the total against")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Slowdown counted as a regression")
+    args = parser.parse_args()
+
+    runs = [profile_once() for _ in range(args.runs)]
+    modules = {module for timings, _ in runs for module in timings}
+    median = {
+        module: statistics.median(timings.get(module, 0.0) for timings, _ in runs)
+        for module in modules
+    }
+    loaded = sorted({module for _, deferred in runs for module in deferred})
+
+    print(f"import server: median {median['server'] * 1e3:.0f} ms over {args.runs} runs")
+    for module, seconds in sorted(median.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f"  {module:<32} {seconds * 1e3:8.1f} ms")
+    print(f"Deferred modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    failed = bool(loaded)
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)["modules"]["server"]
+        change = median["server"] / before - 1
+        failed |= change > args.threshold
+        print(f"Total vs {args.compare}: {change:+.1%}{' REGRESSION' if change > args.threshold else ''}")
+    if args.write:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "modules": dict(sorted(median.items(), key=lambda item: -item[1])),
+            "deferred_modules_loaded": loaded,
+        }
+        BASELINE.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Wrote {BASELINE}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Benchmark experience/name/email extraction: ProfileFieldExtractor vs the per-pattern scans.
+
+Usage:
+    python benchmarks/bench_profile_fields.py [--pages 50] [--resumes 50]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from server import EXPERIENCE_PATTERNS, PROFILE_EXTRACTOR, TECH_SKILLS, experience_fallback  # noqa: E402
+
+FILLER = (
+    "Designed and delivered services for enterprise customers, collaborating with "
+    "product and design teams to improve reliability and reduce costs. "
+).split()
+LINES_PER_PAGE = 45
+
+
+def legacy_extract(text):
+    """The original implementation: a lowercase copy and findall per pattern, then a full line split"""
+    experience_years = None
+    for pattern in EXPERIENCE_PATTERNS:
+        matches = pattern.findall(text.lower())
+        if matches:
+            experience_years = int(matches[0])
+            break
+    if experience_years is None:
+        experience_years = experience_fallback(len(text))
+
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    email = emails[0] if emails else "Not found"
+    name = "Not found"
+    for line in text.strip().split('\n')[:5]:
+        line = line.strip()
+        if len(line) > 2 and len(line) < 50 and not '@' in line:
+            if re.match(r'^[A-Za-z\s]+$', line):
+                name = line
+                break
+    return experience_years, name, email
+
+
+def synthetic_resume(pages, experience_at, rng):
+    """Resume text with the experience phrase on the first page, the last page or nowhere"""
+    lines = ["Alex Morgan", "alex.morgan@example.com"]
+    body = [
+        " ".join(rng.choice(TECH_SKILLS) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(12))
+        for _ in range(pages * LINES_PER_PAGE)
+    ]
+    phrase = f"Software engineer with {rng.randint(1, 15)} years of experience."
+    if experience_at == "start":
+        body.insert(1, phrase)
+    elif experience_at == "end":
+        body.append(phrase)
+    return "\n".join(lines + body)
+
+
+def run(label, extract, texts):
+    start = time.perf_counter()
+    for text in texts:
+        extract(text)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed / len(texts) * 1e3:>9.3f} ms/resume")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for experience_at in ("start", "end", "absent"):
+        texts = [synthetic_resume(args.pages, experience_at, rng) for _ in range(args.resumes)]
+        for text in texts:
+            fields = PROFILE_EXTRACTOR.extract(text)
+            assert legacy_extract(text) == (fields["experience_years"], fields["name"], fields["email"])
+        print(f"{args.resumes} resumes of {args.pages} pages, experience phrase {experience_at}:")
+        legacy = run("legacy", legacy_extract, texts)
+        compiled = run("extractor", PROFILE_EXTRACTOR.extract, texts)
+        print(f"  speedup    {legacy / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark skill extraction: compiled SkillMatcher vs the per-skill substring loop.
+
+Usage:
+    python benchmarks/bench_skill_extraction.py [--resumes 200] [--taxonomy 2000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from server import TECH_SKILLS, SkillMatcher  # noqa: E402
+
+FILLER = (
+    "Designed and delivered services for enterprise customers, collaborating with "
+    "product and design teams to improve reliability and reduce costs. "
+).split()
+
+
+def legacy_extract(text, skills):
+    """The original implementation: one substring scan per skill"""
+    text_lower = text.lower()
+    found_skills = []
+    for skill in skills:
+        if skill in text_lower:
+            found_skills.append(skill)
+    return list(set(found_skills))
+
+
+def synthetic_taxonomy(size, rng):
+    """Extend the built-in vocabulary with generated skill names up to size"""
+    skills = list(TECH_SKILLS)
+    while len(skills) < size:
+        words = rng.randint(1, 3)
+        skills.append(" ".join(
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+            for _ in range(words)
+        ))
+    return skills[:size]
+
+
+def synthetic_resume(skills, words, rng):
+    """Generate resume-like text with a sprinkling of skills"""
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(FILLER))
+    return " ".join(tokens)
+
+
+def run(label, extract, texts):
+    start = time.perf_counter()
+    for text in texts:
+        extract(text)
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(len(text) for text in texts)
+    print(f"  {label:<10} {len(texts) / elapsed:>10.1f} resumes/s  {total_bytes / elapsed / 1e6:>8.2f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--taxonomy", type=int, nargs="*", default=[len(TECH_SKILLS), 1000, 5000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.taxonomy:
+        skills = synthetic_taxonomy(size, rng)
+        texts = [synthetic_resume(skills, args.words, rng) for _ in range(args.resumes)]
+
+        build_start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_time = time.perf_counter() - build_start
+
+        print(f"taxonomy={size} skills, {args.resumes} resumes x {args.words} words "
+              f"(matcher built in {build_time * 1000:.1f} ms)")
+        legacy = run("legacy", lambda text: legacy_extract(text, skills), texts)
+        compiled = run("compiled", matcher.find_all, texts)
+        print(f"  speedup    {legacy / compiled:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Offline microbenchmarks for the resume extraction and job scoring hot paths.
+
+Generates synthetic resumes (PDF, DOCX, TXT) and job catalogs, times the
+extraction and matching functions from server.py and writes the results as
+JSON. Pass --compare with an earlier results file to flag regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --catalog-sizes 10,1000,100000,1000000
+    python benchmarks/run_benchmarks.py --output new.json --compare baseline.json
+
+No MongoDB is needed: match_jobs is measured from the loaded profile
+onwards (profile validation, catalog ranking and response encoding).
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import docx  # noqa: E402
+import server  # noqa: E402
+
+FILLER = (
+    "Designed and delivered services for enterprise customers, collaborating with "
+    "product and design teams to improve reliability and reduce costs across regions."
+).split()
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+    "Machine Learning Engineer", "Full Stack Developer", "Site Reliability Engineer", "Mobile Developer",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Berlin", "London", "San Francisco, CA"]
+LINES_PER_PAGE = 45
+
+
+# Synthetic inputs
+def resume_lines(pages, rng):
+    """Resume text lines: a header, then skill-laden filler for the requested number of pages"""
+    lines = [
+        "Alex Morgan",
+        "alex.morgan@example.com",
+        f"Software engineer with {rng.randint(1, 15)} years of experience in distributed systems.",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        words = [
+            rng.choice(server.TECH_SKILLS) if rng.random() < 0.08 else rng.choice(FILLER)
+            for _ in range(12)
+        ]
+        lines.append(" ".join(words))
+    return lines
+
+
+def make_txt(lines):
+    return "\n".join(lines).encode("utf-8")
+
+
+def make_docx(lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines):
+    """Minimal text PDF, LINES_PER_PAGE lines per page in Helvetica"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        text = "".join(f"({pdf_escape(line)}) Tj T*\n" for line in page_lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 780 Td\n{text}ET".encode("latin-1", "replace")
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def synthetic_jobs(count, rng):
+    for n in range(count):
+        title = rng.choice(TITLES)
+        yield {
+            "id": f"bench_{n}",
+            "title": title,
+            "company": rng.choice(COMPANIES),
+            "required_skills": rng.sample(server.TECH_SKILLS, rng.randint(4, 10)),
+            "experience_required": rng.randint(0, 10),
+            "description": f"{title} " + " ".join(rng.choice(FILLER) for _ in range(30)),
+            "location": rng.choice(LOCATIONS),
+            "salary_range": f"${rng.randint(60, 150)}k - ${rng.randint(150, 250)}k",
+        }
+
+
+# Measurement
+def measure(name, func, params, repeat, warmup=1):
+    """Time func() repeat times after warmup calls; returns a result record"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "mean_s": statistics.fmean(timings),
+        "median_s": statistics.median(timings),
+        "p95_s": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "min_s": timings[0],
+    }
+    print(f"  {name:<28} {json.dumps(params):<40} median {result['median_s'] * 1e3:>10.3f} ms")
+    return result
+
+
+def bench_extraction(page_counts, repeat, rng):
+    results = []
+    for pages in page_counts:
+        lines = resume_lines(pages, rng)
+        text = "\n".join(lines)
+        pdf, document = make_pdf(lines), make_docx(lines)
+        txt = make_txt(lines)
+        params = {"pages": pages, "chars": len(text)}
+        results.append(measure("extract_text_from_pdf", lambda: server.extract_text_from_pdf(pdf),
+                               {**params, "bytes": len(pdf)}, repeat))
+        results.append(measure("extract_text_from_docx", lambda: server.extract_text_from_docx(document),
+                               {**params, "bytes": len(document)}, repeat))
+        results.append(measure("parse_resume_txt", lambda: server.parse_resume("resume.txt", txt),
+                               {**params, "bytes": len(txt)}, repeat))
+        results.append(measure("extract_skills_from_text", lambda: server.extract_skills_from_text(text),
+                               params, repeat))
+        results.append(measure("extract_experience_years", lambda: server.extract_experience_years(text),
+                               params, repeat))
+        results.append(measure("extract_basic_info", lambda: server.extract_basic_info(text), params, repeat))
+    return results
+
+
+def bench_catalogs(catalog_sizes, repeat, rng):
+    results = []
+    candidate_skills = rng.sample(server.TECH_SKILLS, 12)
+    profile_doc = {"id": "bench", "skills": candidate_skills, "experience_years": 6}
+    for size in catalog_sizes:
+        jobs = list(synthetic_jobs(size, rng))
+        start = time.perf_counter()
+        catalog = server.JobCatalog(jobs)
+        build = time.perf_counter() - start
+        results.append({
+            "name": "JobCatalog build", "params": {"jobs": size}, "repeat": 1,
+            "mean_s": build, "median_s": build, "p95_s": build, "min_s": build,
+        })
+        print(f"  {'JobCatalog build':<28} {json.dumps({'jobs': size}):<40} {build * 1e3:>17.3f} ms")
+
+        # The legacy per-job scorer, timed over a bounded sample of postings
+        sample = [job["required_skills"] for job in jobs[:10000]]
+        results.append(measure(
+            "calculate_job_match_score",
+            lambda: [server.calculate_job_match_score(candidate_skills, skills) for skills in sample],
+            {"jobs": size, "calls": len(sample)}, repeat,
+        ))
+
+        text_vector = catalog.transform_text(" ".join(candidate_skills) + " distributed systems engineer")
+        for mode, weight in server.MATCH_MODE_WEIGHTS.items():
+            def match_jobs(weight=weight):
+                profile = server.ProfileSummary(**profile_doc)
+                return catalog.match_json(
+                    profile.skills, profile.experience_years, 10, False,
+                    text_vector=text_vector if weight > 0 else None, semantic_weight=weight,
+                )
+            results.append(measure("match_jobs", match_jobs, {"jobs": size, "mode": mode, "top_k": 10}, repeat))
+        del catalog, jobs
+    return results
+
+
+# Reporting
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result):
+    return result["name"], json.dumps({k: v for k, v in result["params"].items() if k not in ("chars", "bytes")},
+                                      sort_keys=True)
+
+
+def compare(results, baseline_path, threshold):
+    """Print median changes against a baseline run; returns the regressions beyond threshold"""
+    with open(baseline_path) as f:
+        baseline = {result_key(result): result for result in json.load(f)["results"]}
+    regressions = []
+    print(f"\nComparison with {baseline_path} (regression threshold {threshold:.0%}):")
+    for result in results:
+        before = baseline.get(result_key(result))
+        if before is None or not before["median_s"]:
+            continue
+        change = result["median_s"] / before["median_s"] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        print(f"  {result['name']:<28} {result_key(result)[1]:<40} {change:>+8.1%} {flag}")
+        if flag:
+            regressions.append({"name": result["name"], "params": result["params"], "change": change})
+    return regressions
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(",") if size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline extraction and scoring benchmarks")
+    parser.add_argument("--pages", type=parse_sizes, default=[1, 5, 20], help="Resume sizes in pages")
+    parser.add_argument("--catalog-sizes", type=parse_sizes, default=[10, 1000, 10000, 100000],
+                        help="Catalog sizes in postings (add 1000000 for the full-scale run)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Median slowdown counted as a regression")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = datetime.now(timezone.utc)
+    print("Extraction:")
+    results = bench_extraction(args.pages, args.repeat, rng)
+    print("Catalog scoring:")
+    results += bench_catalogs(args.catalog_sizes, args.repeat, rng)
+
+    report = {
+        "meta": {
+            "timestamp": started.isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    if args.compare:
+        report["regressions"] = compare(results, args.compare, args.threshold)
+
+    output = Path(args.output or Path(__file__).resolve().parent / "results" / f"{started:%Y%m%dT%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {output}")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ import axios from "axios";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// Best job matches requested per profile
+const JOB_MATCH_LIMIT = 50;
 
 function App() {
   const [currentView, setCurrentView] = useState('upload');
@@ -52,7 +54,10 @@ function App() {
 
   const fetchJobMatches = async (profileId) => {
     try {
-      const response = await axios.post(`${API}/match-jobs/${profileId}`);
+      // The job cards show every posting detail, not just the default ids and scores
+      const response = await axios.post(`${API}/match-jobs/${profileId}`, null, {
+        params: { fields: 'all', top_k: JOB_MATCH_LIMIT }
+      });
       if (response.data.success) {
         setJobMatches(response.data.matches);
       }
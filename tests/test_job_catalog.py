@@ -0,0 +1,85 @@
+"""Unit tests for JobCatalog scoring and skill gaps; no MongoDB needed"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def job(job_id, skills, experience_required=0):
+    return {
+        "id": job_id, "title": "Engineer", "company": "Acme", "required_skills": skills,
+        "experience_required": experience_required, "description": "", "location": "Remote", "salary_range": "",
+    }
+
+
+def test_skill_gaps_ignore_unmatched_jobs():
+    # Common skills in unrelated jobs must not outrank the gap in the one job the candidate matches
+    jobs = [job(f"filler_{n}", ["cobol" if n < 30 else f"filler{n}", "fortran"]) for n in range(100)]
+    jobs.append(job("target", ["python", "rust"]))
+    gaps = server.JobCatalog(jobs).skill_gaps(["python"], 5)
+    assert [gap["skill"] for gap in gaps] == ["rust"]
+    assert gaps[0]["matched_jobs_requiring"] == 1
+
+
+def test_skill_gaps_without_matches_rank_by_demand():
+    jobs = [job("a", ["cobol", "fortran"]), job("b", ["cobol"]), job("c", ["python", "cobol"])]
+    gaps = server.JobCatalog(jobs).skill_gaps(["haskell"], 5)
+    assert [gap["skill"] for gap in gaps] == ["cobol", "fortran", "python"]
+    assert all(gap["fit_gain"] == 0.0 for gap in gaps)
+
+
+def legacy_score(candidate_skills, job_data, experience_years):
+    """The original per-job match_jobs scoring"""
+    fit_score = server.calculate_job_match_score(candidate_skills, job_data["required_skills"])
+    if experience_years < job_data["experience_required"]:
+        exp_factor = 0.8
+    elif experience_years > job_data["experience_required"] + 2:
+        exp_factor = 1.1
+    else:
+        exp_factor = 1.0
+    return round(min(fit_score * exp_factor, 100.0), 1)
+
+
+def test_scores_match_calculate_job_match_score():
+    skills = [f"skill{n}" for n in range(40)]
+    jobs = [
+        job(f"job_{size}_{matched}", skills[:matched] + [f"other{n}" for n in range(size - matched)], 5)
+        for size in range(1, 41) for matched in range(1, size + 1)
+    ]
+    catalog = server.JobCatalog(jobs)
+    for candidate in (skills[:1], skills[:4], skills[:8], skills[:13], skills):
+        for experience_years in (2, 5, 8):
+            ranked = catalog.rank(candidate, experience_years)
+            assert ranked
+            for row, score, _ in ranked:
+                assert float(score) == legacy_score(candidate, catalog.jobs[row], experience_years), catalog.jobs[row]["id"]
+
+
+def test_text_model_id_is_the_same_for_every_fit_of_the_same_postings():
+    # Each worker fits its own model; cached resume vectors must stay valid across workers
+    jobs = list(server.SAMPLE_JOBS)
+    text_model_id = server.JobCatalog(jobs).text_model_id
+    assert server.JobCatalog(list(reversed(jobs))).text_model_id == text_model_id
+    assert server.JobCatalog(jobs[:-1]).text_model_id != text_model_id
+
+
+def test_match_cache_key_ignores_text_model_in_skills_mode():
+    catalog = server.JobCatalog(server.SAMPLE_JOBS)
+    refit = server.JobCatalog(server.SAMPLE_JOBS[:-1], version=catalog.version)
+    key = lambda catalog, mode: server.match_cache_key("p", ["Python"], 3, catalog, mode, 10)
+    assert key(catalog, "skills") == key(refit, "skills")
+    assert key(catalog, "semantic") != key(refit, "semantic")
+    assert key(catalog, "hybrid") != key(refit, "hybrid")
+
+
+def test_match_json_from_detail_matches_match_dicts():
+    catalog = server.JobCatalog(server.SAMPLE_JOBS)
+    skills = ["python", "react", "sql", "docker"]
+    ranked = catalog.rank(skills, 4, include_unmatched=True)
+    for fields in (tuple(server.JobMatch.model_fields), server.JOB_STATIC_FIELDS, server.JOB_STATIC_FIELDS + ("fit_score",)):
+        _, matches_json = catalog.match_json(skills, 4, include_unmatched=True, fields=fields)
+        expected = catalog.match_dicts(skills, ranked, fields)
+        assert [list(match.items()) for match in json.loads(matches_json)] == [list(match.items()) for match in expected]
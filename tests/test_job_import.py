@@ -0,0 +1,44 @@
+"""Unit tests for job feed row validation; no MongoDB needed"""
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+ROW = {"id": "job_x", "title": "Engineer", "company": "Acme", "experience_required": 2}
+
+
+@pytest.mark.parametrize("skills", [5, True, {"python": 1}, ["python", 3]])
+def test_rejects_non_string_skills(skills):
+    with pytest.raises(ValueError):
+        server.coerce_job_row({**ROW, "required_skills": skills})
+
+
+def test_csv_row_with_extra_fields():
+    feed = io.StringIO("id,title,company,experience_required,required_skills\njob_x,Engineer,Acme,2,python,extra\n")
+    [(_, row)] = server.iter_job_rows(feed, "csv")
+    assert server.coerce_job_row(row)["required_skills"] == ["python"]
+
+
+def test_skills_mapped_onto_vocabulary():
+    unknown = set()
+    job = server.coerce_job_row({**ROW, "required_skills": "Java 8; postgres; Quantum Basket Weaving"}, unknown)
+    assert job["required_skills"] == ["java", "postgresql", "quantum basket weaving"]
+    assert unknown == {"quantum basket weaving"}
+
+
+@pytest.mark.parametrize("fmt, feed", [
+    ("jsonl", b'{"id": "a", "required_skills": "python"}\n{"id": "b\xff"}\n{"id": "c", "required_skills": "sql"}\n'),
+    ("csv", b'id,required_skills\na,python\nb\xff,java\nc,sql\n'),
+])
+def test_invalid_utf8_rejects_only_its_row(fmt, feed):
+    text_stream = io.TextIOWrapper(io.BytesIO(feed), encoding="utf-8", errors="surrogateescape", newline="")
+    rows = list(server.iter_job_rows(text_stream, fmt))
+    assert [line for line, _ in rows] == ([1, 2, 3] if fmt == "jsonl" else [2, 3, 4])
+    assert [isinstance(row, Exception) for _, row in rows] == [False, True, False]
+    with pytest.raises(ValueError, match="UTF-8"):
+        server.coerce_job_row(rows[1][1])
@@ -0,0 +1,17 @@
+"""Unit tests for parse_resume on in-memory uploads; no MongoDB needed"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def test_skill_split_across_txt_blocks_is_found():
+    # "djan|go" straddles the first UPLOAD_CHUNK_BYTES block
+    filler = b"x " * ((server.UPLOAD_CHUNK_BYTES - 4) // 2)
+    content = filler + b"django developer with 5 years of experience\n"
+    assert content[server.UPLOAD_CHUNK_BYTES - 4:server.UPLOAD_CHUNK_BYTES] == b"djan"
+    parsed = server.parse_resume("resume.txt", content)
+    assert parsed["skills"] == server.extract_skills_from_text(content.decode()) == ["django"]
+    assert parsed["experience_years"] == 5
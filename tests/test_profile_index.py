@@ -0,0 +1,61 @@
+"""Unit tests for ProfileSkillIndex candidate ranking; no MongoDB needed"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def brute_force_rank(profiles, job_skills, experience_required, top_k, min_experience_years, max_experience_years):
+    """(rows, scores) from scoring each profile as /match-jobs scores the job for it; ties keep row order"""
+    scored = []
+    for row, (skills, experience_years) in enumerate(profiles):
+        if min_experience_years is not None and experience_years < min_experience_years:
+            continue
+        if max_experience_years is not None and experience_years > max_experience_years:
+            continue
+        fit_score = server.calculate_job_match_score(skills, job_skills)
+        if experience_years < experience_required:
+            exp_factor = 0.8
+        elif experience_years > experience_required + 2:
+            exp_factor = 1.1
+        else:
+            exp_factor = 1.0
+        score = round(min(fit_score * exp_factor, 100.0), 1)
+        if score > 0:
+            scored.append((-score, row))
+    scored.sort()
+    top = scored if top_k is None else scored[:top_k]
+    return [row for _, row in top], [-score for score, _ in top]
+
+
+def test_rank_matches_brute_force():
+    rng = random.Random(7)
+    # A small vocabulary slice, so overlaps repeat and many profiles tie at the top_k cut-off
+    vocabulary = list(server.TECH_SKILLS[:20])
+    profiles = [(rng.sample(vocabulary, rng.randint(1, 8)), rng.randint(0, 12)) for _ in range(600)]
+    index = server.ProfileSkillIndex(capacity=16)
+    for n, (skills, experience_years) in enumerate(profiles):
+        index.add(f"profile_{n}", skills, experience_years)
+    for _ in range(200):
+        job_skills = rng.sample(vocabulary + ["cobol"], rng.randint(1, 12))
+        experience_required = rng.randint(0, 10)
+        top_k = rng.choice([None, 1, 5, 10, 50, 1000])
+        min_experience_years = rng.choice([None, 2, 5])
+        max_experience_years = rng.choice([None, 6, 10])
+        rows, scores = index.rank(job_skills, experience_required, top_k, min_experience_years, max_experience_years)
+        expected_rows, expected_scores = brute_force_rank(
+            profiles, job_skills, experience_required, top_k, min_experience_years, max_experience_years
+        )
+        assert rows.tolist() == expected_rows
+        assert scores.tolist() == expected_scores
+
+
+def test_rank_without_shared_skills_or_slots():
+    index = server.ProfileSkillIndex()
+    index.add("a", ["python"], 3)
+    assert index.rank(["cobol"], 2, 10)[0].tolist() == []
+    assert index.rank(["python"], 2, 0)[0].tolist() == []
+    assert not index.add("a", ["java"], 5)
@@ -0,0 +1,43 @@
+"""Unit tests for SkillMatcher extraction semantics; no MongoDB needed"""
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def reference_skills(text):
+    """Every vocabulary skill that occurs in text on word boundaries, searched one skill at a time"""
+    text = text.lower()
+    return {skill for skill in server.TECH_SKILLS if re.search(r'(?<!\w)' + re.escape(skill) + r'(?!\w)', text)}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Going forward, our error budgets and docs", set()),
+    ("Fluent in R and Go", {"r", "go"}),
+    ("Built a JavaScript SPA", {"javascript"}),
+    ("Java, then JavaScript", {"java", "javascript"}),
+    ("Owned the CI/CD pipelines", {"ci/cd"}),
+    ("Wrote unit testing and integration testing suites", {"unit testing", "integration testing", "testing"}),
+    ("Node.js? No: NodeJS, scikit-learn and Power BI", {"nodejs", "scikit-learn", "power bi"}),
+])
+def test_find_all(text, expected):
+    assert set(server.SKILL_MATCHER.find_all(text)) == expected == reference_skills(text)
+
+
+def test_find_all_reports_first_appearance_once():
+    assert server.SKILL_MATCHER.find_all("python, Docker, PYTHON, docker and python") == ["python", "docker"]
+
+
+def test_find_all_matches_per_skill_reference():
+    rng = random.Random(1)
+    words = list(server.TECH_SKILLS) + ["the", "golang", "javas", "err", "ci", "cd", "unit", "learning", "node"]
+    separators = [" ", ", ", "/", "-", ".", "\n", "", "(", ")"]
+    for _ in range(3000):
+        text = "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+        assert set(server.SKILL_MATCHER.find_all(text)) == reference_skills(text), text